@@ -0,0 +1,85 @@
+"""Frame times of the standard and lite render modes.
+
+Run with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_render_modes.py [tasks] [subtasks] [frames]
+
+Each frame is one change followed by a synchronous repaint of the window:
+toggling a visible subtask, or scrolling the list by one step.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+from todo import TodoApp, default_settings, format_todo, new_task
+
+
+def write_list(path, task_count, subtask_count):
+    tasks = [new_task(f"Task {i}", [f"Subtask {i}.{j}" for j in range(subtask_count)]) for i in range(task_count)]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(format_todo(tasks, default_settings()))
+
+
+def finish_build(app, window):
+    while len(window.task_cards) < len(window.tasks):
+        window.build_next_batch()
+    app.processEvents()
+
+
+def time_frames(frames, change, widget):
+    samples = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        change(frame)
+        widget.repaint()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def measure(app, window, render_mode, frames):
+    window.document.set_settings({"render_mode": render_mode})
+    finish_build(app, window)
+    scroll_bar = window.scroll.verticalScrollBar()
+    scroll_bar.setValue(0)
+    app.processEvents()
+
+    card = window.task_cards[window.visible_cards()[0]]
+    toggle = time_frames(frames, lambda frame: window.document.set_checked(card.index, 0, frame % 2 == 0), window)
+
+    step = max(scroll_bar.singleStep() * 3, 1)
+    scroll = time_frames(frames, lambda frame: scroll_bar.setValue((frame + 1) * step), window)
+    return {"toggle": toggle, "scroll": scroll}
+
+
+def main():
+    defaults = [60, 20, 30]
+    task_count, subtask_count, frames = [int(arg) for arg in sys.argv[1:4]] + defaults[len(sys.argv[1:4]):]
+    app = QApplication(sys.argv[:1])
+    app.setStyle("Fusion")
+    window = TodoApp()
+    window.resize(600, 850)
+    window.show()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.txt")
+        write_list(path, task_count, subtask_count)
+        window.document.load(path)
+
+    results = {mode: measure(app, window, mode, frames) for mode in ("standard", "lite")}
+
+    print(f"{task_count} tasks x {subtask_count} subtasks, {frames} frames, times in ms")
+    print(f"{'frame':<10}{'mode':<10}{'median':>8}{'p90':>8}{'max':>8}")
+    for kind in ("toggle", "scroll"):
+        for mode, samples in results.items():
+            samples = sorted(samples[kind])
+            p90 = samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+            print(f"{kind:<10}{mode:<10}{statistics.median(samples):>8.2f}{p90:>8.2f}{samples[-1]:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import http.client
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from todo import MAX_REQUEST_BODY, LiveServer, TodoDocument, default_settings, format_todo, new_task
+
+TIMEOUT = 10
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost", timeout=TIMEOUT)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(TIMEOUT)
+        self.sock.connect(self.path)
+
+
+def run_client(app, func):
+    # Requests block on the Qt thread answering them, so the test pumps events meanwhile
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = func()
+        except BaseException as e:
+            outcome["error"] = e
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + TIMEOUT
+    while thread.is_alive() and time.monotonic() < deadline:
+        app.processEvents()
+        thread.join(0.005)
+    assert not thread.is_alive(), "client timed out"
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+@pytest.fixture
+def document(qapp, tmp_path):
+    tasks = [new_task("Deploy", ["build", "ship"]), new_task("Review", ["read"])]
+    path = tmp_path / "list.txt"
+    path.write_text(format_todo(tasks, default_settings()), encoding="utf-8")
+    document = TodoDocument()
+    document.load(str(path))
+    return document
+
+
+@pytest.fixture
+def server(document):
+    server = LiveServer(document)
+    server.start("127.0.0.1:0")
+    yield server
+    server.stop()
+
+
+class Client:
+    def __init__(self, app, server, connect=None):
+        self.app = app
+        self.server = server
+        self.port = int(server.url.rstrip("/").rsplit(":", 1)[1]) if server.url.startswith("http") else None
+        self.connect = connect or (lambda: http.client.HTTPConnection("127.0.0.1", self.port, timeout=TIMEOUT))
+
+    def request(self, method, path, data=None, headers=None, token=True, raw_body=None):
+        headers = dict(headers or {})
+        if token:
+            headers.setdefault("Authorization", f"Bearer {self.server.token}")
+        body = raw_body
+        if data is not None:
+            body = json.dumps(data).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+
+        def send():
+            connection = self.connect()
+            try:
+                connection.request(method, path, body, headers)
+                response = connection.getresponse()
+                return response.status, response.getheader("Content-Type"), response.read()
+            finally:
+                connection.close()
+        return run_client(self.app, send)
+
+    def json(self, method, path, data=None, **kwargs):
+        status, _, payload = self.request(method, path, data, **kwargs)
+        return status, json.loads(payload)
+
+
+@pytest.fixture
+def client(qapp, server):
+    return Client(qapp, server)
+
+
+def test_routes(client, document):
+    status, content_type, page = client.request("GET", "/", token=False)
+    assert status == 200 and content_type.startswith("text/html")
+    assert client.server.token in page.decode("utf-8")
+
+    status, data = client.json("GET", "/api/list")
+    assert status == 200 and [row[0] for row in data["tasks"]] == ["Deploy", "Review"]
+
+    status, data = client.json("GET", "/api/tasks?task=Review")
+    assert status == 200 and [task["name"] for task in data["tasks"]] == ["Review"]
+
+    assert client.json("POST", "/api/tasks", {"name": "Ship", "sub_tasks": ["tag"]}) == (200, {"task": 2})
+    assert client.json("POST", "/api/subtasks", {"task": "Ship", "text": "announce"}) == (200, {"task": 2, "sub": 1})
+    assert document.tasks[2]["sub_tasks"] == ["tag", "announce"]
+
+    client.json("POST", "/api/check", {"task": 0, "sub": 0, "checked": True})
+    status, data = client.json("POST", "/api/reset", {"tasks": ["Deploy"]})
+    assert status == 200 and data["checked"] == 0
+    assert not document.is_checked(0, 0)
+
+
+def test_error_statuses(client):
+    assert client.json("GET", "/api/nothing")[0] == 404
+    assert client.json("GET", "/api/check")[0] == 405
+    assert client.json("POST", "/api/check", {"task": "Missing", "sub": 0})[0] == 404
+    assert client.json("POST", "/api/tasks", {"name": "two\nlines"})[0] == 400
+    status, _, _ = client.request("POST", "/api/check", headers={
+        "Content-Type": "application/json", "Content-Length": str(MAX_REQUEST_BODY + 1)})
+    assert status == 413
+
+
+def test_check_toggles_without_a_value(client, document):
+    assert client.json("POST", "/api/check", {"task": "Deploy", "sub": "ship"}) == (
+        200, {"task": 0, "sub": 1, "checked": True})
+    assert document.is_checked(0, 1)
+    assert client.json("POST", "/api/check", {"task": 0, "sub": 1})[1]["checked"] is False
+    assert not document.is_checked(0, 1)
+
+
+def read_event(stream):
+    lines = []
+    while True:
+        line = stream.readline().decode("utf-8").rstrip("\r\n")
+        if not line and lines:
+            return lines
+        if line and not line.startswith(":"):
+            lines.append(line)
+
+
+def test_events_reach_every_client(qapp, client, document):
+    def subscribe():
+        connection = socket.create_connection(("127.0.0.1", client.port), timeout=TIMEOUT)
+        connection.sendall(f"GET /api/events?token={client.server.token} HTTP/1.1\r\n"
+                           f"Host: 127.0.0.1:{client.port}\r\n\r\n".encode("latin-1"))
+        stream = connection.makefile("rb")
+        assert stream.readline().startswith(b"HTTP/1.1 200")
+        while stream.readline() not in (b"\r\n", b""):
+            pass
+        return connection, stream
+    subscribers = [run_client(qapp, subscribe) for _ in range(3)]
+    try:
+        document.set_checked(1, 0, True)
+        for _, stream in subscribers:
+            event = run_client(qapp, lambda: read_event(stream))
+            assert event[0] == "event: check"
+            assert json.loads(event[1].removeprefix("data: ")) == {"task": 1, "sub": 0, "checked": True}
+    finally:
+        for connection, stream in subscribers:
+            stream.close()
+            connection.close()
+
+
+def test_batch_failure_rolls_back(client, document):
+    status, data = client.json("POST", "/api/batch", {"operations": [
+        {"op": "check", "task": 0, "sub": 0},
+        {"op": "add_task", "name": "Extra"},
+        {"op": "check", "task": 9, "sub": 0}
+    ]})
+    assert status == 404 and data["index"] == 2
+    assert not document.is_checked(0, 0)
+    assert [task["name"] for task in document.tasks] == ["Deploy", "Review"]
+    assert not document.undo_stack.is_held()
+
+    status, data = client.json("POST", "/api/batch", {"operations": [{"op": "check", "task": 0, "sub": 0}]})
+    assert status == 200 and data == {"results": [{"task": 0, "sub": 0, "checked": True}]}
+
+
+def test_writes_are_refused_while_customizing(client, document):
+    document.undo_stack.hold()
+    try:
+        assert client.json("POST", "/api/check", {"task": 0, "sub": 0})[0] == 409
+    finally:
+        document.undo_stack.release()
+    assert not document.is_checked(0, 0)
+
+
+@pytest.mark.parametrize("headers, token, status", [
+    ({"Host": "attacker.example"}, True, 403),
+    ({"Origin": "https://attacker.example"}, True, 403),
+    ({}, False, 401),
+    ({"Authorization": "Bearer wrong"}, True, 401),
+    ({"Content-Type": "text/plain"}, True, 415)
+])
+def test_foreign_requests_are_rejected(client, document, headers, token, status):
+    headers = {"Content-Type": "application/json", **headers}
+    got, _, _ = client.request("POST", "/api/check", headers=headers, token=token, raw_body=b'{"task": 0, "sub": 0}')
+    assert got == status
+    assert not document.is_checked(0, 0)
+
+
+def test_same_origin_and_query_token_are_accepted(client):
+    origin = {"Host": f"localhost:{client.port}", "Origin": f"http://localhost:{client.port}"}
+    assert client.json("POST", "/api/check", {"task": 0, "sub": 0}, headers=origin)[0] == 200
+    assert client.json("GET", f"/api/list?token={client.server.token}", token=False)[0] == 200
+
+
+def test_non_loopback_addresses_are_refused(document):
+    with pytest.raises(ValueError):
+        LiveServer(document).start("0.0.0.0:0")
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_unix_socket(qapp, document, tmp_path):
+    path = str(tmp_path / "todo.sock")
+    server = LiveServer(document)
+    server.start(path)
+    try:
+        client = Client(qapp, server, lambda: UnixHTTPConnection(path))
+        assert client.json("GET", "/api/list")[0] == 200
+        assert client.json("GET", "/api/list", token=False)[0] == 401
+        assert client.json("POST", "/api/check", {"task": 0, "sub": 0})[1]["checked"] is True
+    finally:
+        server.stop()
@@ -0,0 +1,68 @@
+import os
+import sys
+
+import pytest
+from PyQt6.QtCore import QEvent, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from todo import TodoApp, default_settings, format_todo, new_task
+
+CYCLES = 1000
+WARMUP_CYCLES = 20
+WIDGET_TOLERANCE = 10
+RSS_TOLERANCE_KB = 16 * 1024
+
+
+def rss_kb():
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def settle(app):
+    app.processEvents()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+
+@pytest.fixture
+def window(qapp, tmp_path):
+    tasks = [new_task(f"Task {i}", [f"Subtask {i}.{j}" for j in range(4)]) for i in range(6)]
+    path = tmp_path / "list.txt"
+    path.write_text(format_todo(tasks, default_settings()), encoding="utf-8")
+    window = TodoApp()
+    window.resize(600, 850)
+    window.show()
+    window.document.load(str(path))
+    settle(qapp)
+    yield window
+    window.close()
+    window.deleteLater()
+    settle(qapp)
+
+
+def finish_build(window):
+    while len(window.task_cards) < len(window.tasks):
+        window.build_next_batch()
+
+
+def cycle(app, window):
+    window.refresh_tasks()
+    finish_build(window)
+    QTimer.singleShot(0, lambda: app.activeModalWidget().reject())
+    window.customize_tasks()
+    finish_build(window)
+    settle(app)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads RSS from /proc")
+def test_refresh_and_customize_cycles_stay_flat(qapp, window):
+    for _ in range(WARMUP_CYCLES):
+        cycle(qapp, window)
+    widgets_before, rss_before = len(QApplication.allWidgets()), rss_kb()
+
+    for _ in range(CYCLES):
+        cycle(qapp, window)
+    widgets_after, rss_after = len(QApplication.allWidgets()), rss_kb()
+
+    assert widgets_after <= widgets_before + WIDGET_TOLERANCE
+    assert rss_after <= rss_before + RSS_TOLERANCE_KB
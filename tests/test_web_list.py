@@ -0,0 +1,14 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+WEB_TESTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web")
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+@pytest.mark.parametrize("script", ["list_after_edit.js"])
+def test_web_script(script):
+    result = subprocess.run(["node", os.path.join(WEB_TESTS, script)], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
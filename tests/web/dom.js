@@ -0,0 +1,224 @@
+// Minimal DOM shim: just enough of the browser to run the script of web_html/index.html in node
+const VOID = new Set(['input', 'img', 'br', 'hr', 'meta', 'link']);
+let registry = null;
+let stats = { created: 0 };
+
+function decode(t) {
+    return t.replace(/&lt;/g, '<').replace(/&gt;/g, '>').replace(/&quot;/g, '"').replace(/&#39;/g, "'").replace(/&amp;/g, '&');
+}
+function encode(t) {
+    return String(t).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+}
+
+class ClassList {
+    constructor(el) { this.el = el; }
+    get list() { return this.el.className.split(/\s+/).filter(Boolean); }
+    add(...c) { const l = this.list; c.forEach(x => { if (!l.includes(x)) l.push(x); }); this.el.className = l.join(' '); }
+    remove(...c) { this.el.className = this.list.filter(x => !c.includes(x)).join(' '); }
+    contains(c) { return this.list.includes(c); }
+    toggle(c, force) { const has = this.contains(c); const want = force === undefined ? !has : force; if (want) this.add(c); else this.remove(c); return want; }
+}
+
+class Node_ {
+    constructor() { this.parentNode = null; this.childNodes = []; }
+    get firstChild() { return this.childNodes[0] || null; }
+    get lastChild() { return this.childNodes[this.childNodes.length - 1] || null; }
+    get nextSibling() { if (!this.parentNode) return null; const c = this.parentNode.childNodes; return c[c.indexOf(this) + 1] || null; }
+    get previousSibling() { if (!this.parentNode) return null; const c = this.parentNode.childNodes; return c[c.indexOf(this) - 1] || null; }
+    get isConnected() { let n = this; while (n.parentNode) n = n.parentNode; return n === document.body || n === document.documentElement; }
+    remove() { if (this.parentNode) this.parentNode.removeChild(this); }
+}
+
+class Text_ extends Node_ {
+    constructor(t) { super(); this.data = t; this.nodeType = 3; }
+    get textContent() { return this.data; }
+    set textContent(v) { this.data = String(v); }
+}
+
+class Element_ extends Node_ {
+    constructor(tag) {
+        super();
+        stats.created++;
+        this.nodeType = 1;
+        this.tagName = tag.toUpperCase();
+        this.attrs = {};
+        this.className = '';
+        this.classList = new ClassList(this);
+        this.dataset = {};
+        this.style = {};
+        this.listeners = {};
+        this._value = '';
+        this.checked = false;
+        this.disabled = false;
+        this.scrollTop = 0;
+        this.files = [];
+    }
+    get children() { return this.childNodes.filter(c => c.nodeType === 1); }
+    get firstElementChild() { return this.children[0] || null; }
+    get lastElementChild() { const c = this.children; return c[c.length - 1] || null; }
+    get nextElementSibling() { let n = this.nextSibling; while (n && n.nodeType !== 1) n = n.nextSibling; return n; }
+    get id() { return this.attrs.id || ''; }
+    set id(v) { this.attrs.id = v; }
+    get type() { return this.attrs.type || ''; }
+    set type(v) { this.attrs.type = v; }
+    get value() { return this._value; }
+    set value(v) { this._value = String(v); }
+    setAttribute(k, v) {
+        if (k === 'class') this.className = v;
+        else if (k.startsWith('data-')) this.dataset[k.slice(5).replace(/-([a-z])/g, (_, c) => c.toUpperCase())] = v;
+        else if (k === 'value') this._value = decode(v);
+        else if (k === 'checked') this.checked = true;
+        else this.attrs[k] = v;
+    }
+    getAttribute(k) {
+        if (k === 'class') return this.className;
+        if (k.startsWith('data-')) return this.dataset[k.slice(5).replace(/-([a-z])/g, (_, c) => c.toUpperCase())];
+        return this.attrs[k] === undefined ? null : this.attrs[k];
+    }
+    appendChild(c) { if (c.isFragment) { [...c.childNodes].forEach(x => this.appendChild(x)); return c; } c.remove(); c.parentNode = this; this.childNodes.push(c); return c; }
+    append(...cs) { cs.forEach(c => this.appendChild(typeof c === 'string' ? new Text_(c) : c)); }
+    insertBefore(c, ref) {
+        if (!ref) return this.appendChild(c);
+        if (c.isFragment) { [...c.childNodes].forEach(x => this.insertBefore(x, ref)); return c; }
+        c.remove(); c.parentNode = this; this.childNodes.splice(this.childNodes.indexOf(ref), 0, c); return c;
+    }
+    removeChild(c) { const i = this.childNodes.indexOf(c); if (i < 0) throw new Error('not a child'); this.childNodes.splice(i, 1); c.parentNode = null; return c; }
+    replaceChildren(...cs) { [...this.childNodes].forEach(c => this.removeChild(c)); this.append(...cs); }
+    get textContent() { return this.childNodes.map(c => c.textContent).join(''); }
+    set textContent(v) { this.childNodes.forEach(c => c.parentNode = null); this.childNodes = []; if (v !== '' && v !== null && v !== undefined) this.appendChild(new Text_(String(v))); }
+    set innerHTML(html) { this.childNodes.forEach(c => c.parentNode = null); this.childNodes = []; parseInto(this, html); }
+    get innerHTML() { return this.childNodes.map(serialize).join(''); }
+    matches(sel) { return sel.split(',').some(s => matchCompound(this, s.trim())); }
+    closest(sel) { let n = this; while (n && n.nodeType === 1) { if (n.matches(sel)) return n; n = n.parentNode; } return null; }
+    querySelectorAll(sel) { const out = []; walk(this, n => { if (n !== this && matchSelector(n, sel, this)) out.push(n); }); return out; }
+    querySelector(sel) { return this.querySelectorAll(sel)[0] || null; }
+    addEventListener(t, f) { (this.listeners[t] = this.listeners[t] || []).push(f); }
+    removeEventListener(t, f) { this.listeners[t] = (this.listeners[t] || []).filter(x => x !== f); }
+    dispatchEvent(e) {
+        e.target = e.target || this;
+        let n = this; let stopped = false;
+        e.stopPropagation = () => stopped = true;
+        e.preventDefault = () => e.defaultPrevented = true;
+        while (n && !stopped) { (n.listeners && n.listeners[e.type] || []).slice().forEach(f => f.call(n, e)); if (!e.bubbles) break; n = n.parentNode; }
+        return !e.defaultPrevented;
+    }
+    click() {
+        if (this.tagName === 'INPUT' && this.type === 'checkbox') this.checked = !this.checked;
+        this.dispatchEvent({ type: 'click', bubbles: true });
+        if (this.tagName === 'INPUT' && this.type === 'checkbox') this.dispatchEvent({ type: 'change', bubbles: true });
+    }
+    focus() { document.activeElement = this; }
+    blur() {}
+    select() {}
+    get clientHeight() { return this._clientHeight !== undefined ? this._clientHeight : 0; }
+    get offsetHeight() { return global.measure ? global.measure(this) : 0; }
+    getBoundingClientRect() { return { top: 0, left: 0, right: 100, bottom: 20, width: 100, height: 20 }; }
+}
+
+function walk(n, f) { n.childNodes.forEach(c => { if (c.nodeType === 1) { f(c); walk(c, f); } }); }
+
+function matchCompound(n, s) {
+    if (!s) return true;
+    const parts = s.match(/([#.]?[\w-]+|\[[^\]]+\])/g) || [];
+    return parts.every(p => {
+        if (p[0] === '#') return n.id === p.slice(1);
+        if (p[0] === '.') return n.classList.contains(p.slice(1));
+        if (p[0] === '[') {
+            const m = p.slice(1, -1).match(/^([\w-]+)(?:="?([^"]*)"?)?$/);
+            const v = n.getAttribute(m[1]);
+            return m[2] === undefined ? v !== null && v !== undefined : String(v) === m[2];
+        }
+        return n.tagName === p.toUpperCase();
+    });
+}
+function matchSelector(n, sel, root) {
+    return sel.split(',').some(alt => {
+        const chain = alt.trim().split(/\s+/);
+        if (!matchCompound(n, chain[chain.length - 1])) return false;
+        let i = chain.length - 2; let p = n.parentNode;
+        while (i >= 0 && p && p !== root) { if (matchCompound(p, chain[i])) i--; p = p.parentNode; }
+        return i < 0;
+    });
+}
+
+function parseInto(root, html) {
+    const re = /<!--[\s\S]*?-->|<\/([\w-]+)\s*>|<([\w-]+)((?:\s+[\w-:]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]+))?)*)\s*\/?>|([^<]+)/g;
+    const stack = [root];
+    let m;
+    let rawUntil = null;
+    while ((m = re.exec(html))) {
+        const top = stack[stack.length - 1];
+        if (m[0].startsWith('<!--')) continue;
+        if (m[1]) { const t = m[1].toUpperCase(); for (let i = stack.length - 1; i > 0; i--) if (stack[i].tagName === t) { stack.length = i; break; } continue; }
+        if (m[2]) {
+            const el = new Element_(m[2]);
+            const ar = /([\w-:]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?/g; let a;
+            while ((a = ar.exec(m[3] || ''))) el.setAttribute(a[1], a[2] !== undefined ? a[2] : a[3] !== undefined ? a[3] : a[4] !== undefined ? a[4] : '');
+            top.appendChild(el);
+            if (el.tagName === 'SCRIPT' || el.tagName === 'STYLE') {
+                const end = html.indexOf(`</${m[2]}>`, re.lastIndex);
+                el.appendChild(new Text_(html.slice(re.lastIndex, end)));
+                re.lastIndex = end + m[2].length + 3;
+                continue;
+            }
+            if (!VOID.has(m[2].toLowerCase()) && !m[0].endsWith('/>')) stack.push(el);
+            continue;
+        }
+        if (m[4]) top.appendChild(new Text_(decode(m[4])));
+    }
+}
+function serialize(n) {
+    if (n.nodeType === 3) return encode(n.data);
+    const tag = n.tagName.toLowerCase();
+    let a = '';
+    if (n.className) a += ` class="${n.className}"`;
+    for (const k in n.attrs) a += ` ${k}="${encode(n.attrs[k])}"`;
+    for (const k in n.dataset) a += ` data-${k.replace(/[A-Z]/g, c => '-' + c.toLowerCase())}="${encode(n.dataset[k])}"`;
+    return VOID.has(tag) ? `<${tag}${a}>` : `<${tag}${a}>${n.childNodes.map(serialize).join('')}</${tag}>`;
+}
+
+class Fragment_ extends Element_ { constructor() { super('#fragment'); this.isFragment = true; } }
+
+const document = {
+    body: null,
+    documentElement: null,
+    listeners: {},
+    createElement: t => new Element_(t),
+    createTextNode: t => new Text_(t),
+    createDocumentFragment: () => new Fragment_(),
+    getElementById(id) { let r = null; walk(this.documentElement, n => { if (!r && n.id === id) r = n; }); return r; },
+    querySelector(s) { return this.documentElement.querySelector(s); },
+    querySelectorAll(s) { return this.documentElement.querySelectorAll(s); },
+    addEventListener(t, f) { (this.listeners[t] = this.listeners[t] || []).push(f); },
+    removeEventListener(t, f) { this.listeners[t] = (this.listeners[t] || []).filter(x => x !== f); },
+};
+
+let frames = [];
+function load(path) {
+    const fs = require('fs');
+    const src = fs.readFileSync(path, 'utf8');
+    document.documentElement = new Element_('html');
+    const bodyHtml = src.slice(src.indexOf('<body>') + 6, src.lastIndexOf('</body>'));
+    document.body = new Element_('body');
+    document.body.parentNode = document.documentElement;
+    document.documentElement.childNodes.push(document.body);
+    parseInto(document.body, bodyHtml.replace(/<script>[\s\S]*<\/script>/, ''));
+    const store = {};
+    global.document = document;
+    global.window = global;
+    global.localStorage = { getItem: k => k in store ? store[k] : null, setItem: (k, v) => store[k] = String(v), removeItem: k => delete store[k], _store: store };
+    global.requestAnimationFrame = f => { frames.push(f); return frames.length; };
+    global.cancelAnimationFrame = () => {};
+    global.alert = m => { (global.alerts = global.alerts || []).push(m); };
+    global.confirm = () => true;
+    global.prompt = global.prompt || (() => null);
+    global.listeners = {};
+    global.addEventListener = (t, f) => (global.listeners[t] = global.listeners[t] || []).push(f);
+    const js = src.slice(src.lastIndexOf('<script>') + 8, src.lastIndexOf('</script>'));
+    (0, eval)(js.replace(/class (TodoApp|SearchIndex|TaskStore) /g, 'global.$1 = class $1 ').replace(/const (CARD_GAP|OVERSCAN_PX|[A-Z_]+) =/g, 'global.$1 ='));
+    (document.listeners.DOMContentLoaded || []).forEach(f => f());
+    return global.todoApp;
+}
+function flushFrames() { let n = 0; while (frames.length && n++ < 100) { const f = frames; frames = []; f.forEach(x => x(0)); } }
+
+module.exports = { load, flushFrames, stats, Element_, serialize };
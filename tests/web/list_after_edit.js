@@ -0,0 +1,47 @@
+// Rows of the main list after tasks are deleted in the Customize modal
+const assert = require('assert');
+const path = require('path');
+const dom = require('./dom.js');
+
+global.measure = node => node.classList.contains('task-segment') ? (node.dataset.sub < 0 ? 60 : 44) : 0;
+console.warn = () => {};
+
+const app = dom.load(path.join(__dirname, '..', '..', 'web_html', 'index.html'));
+const container = document.getElementById('tasksContainer');
+container._clientHeight = 600;
+
+function show(names) {
+    app.tasks = names.map(name => ({ name, subTasks: ['first', 'second'], completed: [] }));
+    app.showScreen('mainScreen');
+    dom.flushFrames();
+}
+
+function row(position, subIndex) {
+    return container.querySelectorAll('.task-segment')
+        .find(node => node.dataset.task == position && node.dataset.sub == subIndex);
+}
+
+function titles() {
+    return container.querySelectorAll('.task-title').map(node => node.textContent);
+}
+
+// Delete, close, click: the click reaches the task now shown at that position
+show(['A', 'B', 'C']);
+app.customizeTasks();
+app.deleteTask(0);
+app.closeCustomizeModal();
+dom.flushFrames();
+assert.deepStrictEqual(titles(), ['B', 'C']);
+assert.strictEqual(row(2, 0), undefined);
+row(0, 0).querySelector('.subtask-label').click();
+assert.deepStrictEqual(app.tasks.map(task => task.completed[0] || false), [true, false]);
+
+// A row built before an edit neither throws nor toggles another task
+show(['A', 'B', 'C']);
+app.customizeTasks();
+const stale = row(2, 1);
+app.deleteTask(0);
+stale.querySelector('.subtask-label').click();
+dom.flushFrames();
+assert.deepStrictEqual(app.tasks.map(task => task.completed[1] || false), [false, false]);
+assert.deepStrictEqual(titles(), ['B', 'C']);
@@ -1,23 +1,80 @@
+import argparse
+import hashlib
+import json
 import os
 import sys
+from PyQt6.QtNetwork import QLocalSocket
+
+INSTANCE_TIMEOUT_MS = 500
+
+def instance_server_name():
+    # One running instance per user; the hash keeps the name valid as a pipe or socket name
+    user = os.environ.get("USER") or os.environ.get("USERNAME") or ""
+    return f"SimplyTodoTask-{hashlib.sha1(user.encode('utf-8')).hexdigest()[:12]}"
+
+def forward_to_running_instance(file_paths, serve=None):
+    socket = QLocalSocket()
+    socket.connectToServer(instance_server_name())
+    if not socket.waitForConnected(INSTANCE_TIMEOUT_MS):
+        return False
+    message = {"files": [os.path.abspath(path) for path in file_paths], "serve": serve}
+    socket.write(json.dumps(message).encode('utf-8') + b"\n")
+    forwarded = socket.waitForBytesWritten(INSTANCE_TIMEOUT_MS)
+    socket.disconnectFromServer()
+    return forwarded
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Simply TodoTask")
+    parser.add_argument("files", nargs="*", metavar="FILE", help="list file to open")
+    parser.add_argument("--serve", nargs="?", const="", metavar="ADDRESS",
+                        help="start the local web UI and JSON API on host:port or a Unix socket path")
+    parser.add_argument("--new-instance", action="store_true",
+                        help="start a separate window instead of handing the files to the running one")
+    return parser.parse_known_args()
+
+# A second launch hands its files over before the widget modules load, so it exits at once
+if __name__ == "__main__":
+    args, qt_args = parse_arguments()
+    if not args.new_instance and forward_to_running_instance(args.files, args.serve):
+        sys.exit(0)
+
+import asyncio
+import base64
+import concurrent.futures
+import heapq
+import hmac
+import html
+import ipaddress
+import mimetypes
+import re
+import secrets
+import stat
+import subprocess
+import threading
+import time
+import urllib.parse
 import webbrowser
-from datetime import datetime
+from array import array
+from collections import OrderedDict, deque
+from functools import lru_cache
+from datetime import date, datetime, timedelta
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QLabel, QPushButton, QCheckBox, QScrollArea, QFrame, QLineEdit,
     QMessageBox, QFileDialog, QColorDialog, QTabWidget, QTextEdit,
     QDialog, QDialogButtonBox, QComboBox, QGroupBox, QSizePolicy,
-    QSpacerItem, QGridLayout, QMenu, QMenuBar
+    QSpacerItem, QGridLayout, QMenu, QMenuBar, QProgressBar, QFileIconProvider, QToolButton
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QSize, QTimer, QPropertyAnimation, QEasingCurve
-from PyQt6.QtGui import QFont, QPalette, QColor, QPixmap, QIcon, QPainter, QAction, QPainterPath
+from PyQt6.QtCore import Qt, QFileInfo, QObject, QThreadPool, QUrl, pyqtSignal, QSize, QTimer, QPropertyAnimation, QEasingCurve
+from PyQt6.QtGui import QFont, QPalette, QColor, QPixmap, QIcon, QPainter, QAction, QPainterPath, QKeySequence, QShortcut, QDesktopServices
+from PyQt6.QtNetwork import QLocalServer
 from PyQt6.QtSvg import QSvgRenderer
 
 def resource_path(relative_path):
     try:
         base_path = sys._MEIPASS
     except Exception:
-        base_path = os.path.abspath(".")
+        base_path = os.path.dirname(os.path.abspath(__file__))
     
     return os.path.join(base_path, relative_path)
 
@@ -31,6 +88,13 @@ def load_pixmap(filename):
     except Exception:
         return QPixmap()
 
+@lru_cache(maxsize=None)
+def load_scaled_pixmap(filename, size):
+    pixmap = load_pixmap(filename)
+    if pixmap.isNull():
+        return pixmap
+    return pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
 def load_icon(filename):
     try:
         path = resource_path(filename)
@@ -41,218 +105,2660 @@ def load_icon(filename):
     except Exception:
         return QIcon()
 
-class ModernButton(QPushButton):
-    def __init__(self, text, color="#2196F3", icon=None, height=40):
-        super().__init__(text)
-        self.setFixedHeight(height)
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {color};
-                color: white;
-                border: none;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 12px;
-                padding: 8px 16px;
-            }}
-            QPushButton:hover {{
-                background-color: {self._darken_color(color)};
+DEFAULT_SETTINGS = {
+    "title": "Simply TodoTask",
+    "font_size": "medium",
+    "strikethrough": True,
+    "theme": "light",
+    "render_mode": "standard",
+    "undo_memory_kb": 4096,
+    "widget_pool_size": 1024,
+    "reset_schedule": "",
+    "last_reset": ""
+}
+
+def default_settings():
+    return dict(DEFAULT_SETTINGS)
+
+def new_task(name="New To-Do", sub_tasks=None):
+    sub_tasks = ["New task"] if sub_tasks is None else list(sub_tasks)
+    return {
+        "name": name,
+        "sub_tasks": sub_tasks,
+        "base_color": "default",
+        "selected_color": "default",
+        "link": "",
+        "due": "",
+        "sub_task_dues": [""] * len(sub_tasks),
+        "collapsed": False
+    }
+
+def parse_due(text):
+    try:
+        return datetime.fromisoformat(text.strip()) if text.strip() else None
+    except ValueError:
+        return None
+
+def format_due(when):
+    return when.strftime("%Y-%m-%d %H:%M")
+
+def parse_todo_lines(lines):
+    tasks = []
+    settings = default_settings()
+    check_bits = []
+
+    current_task = None
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        if line.startswith("[SETTINGS]"):
+            i += 1
+            while i < len(lines) and not lines[i].startswith("[TASK]") and lines[i].strip() != "":
+                line = lines[i].strip()
+                if line.startswith("title="):
+                    settings["title"] = line.split('=', 1)[1]
+                elif line.startswith("font_size="):
+                    font_size = line.split('=', 1)[1]
+                    if font_size in ['piccolo', 'medio', 'grande']:
+                        font_size = 'small' if font_size == 'piccolo' else 'medium' if font_size == 'medio' else 'large'
+                    settings["font_size"] = font_size
+                elif line.startswith("strikethrough="):
+                    settings["strikethrough"] = line.split('=', 1)[1].lower() == "true"
+                elif line.startswith("theme="):
+                    settings["theme"] = line.split('=', 1)[1]
+                elif line.startswith("render_mode="):
+                    settings["render_mode"] = line.split('=', 1)[1]
+                elif line.startswith("undo_memory_kb="):
+                    try:
+                        settings["undo_memory_kb"] = max(0, int(line.split('=', 1)[1]))
+                    except ValueError:
+                        pass
+                elif line.startswith("widget_pool_size="):
+                    try:
+                        settings["widget_pool_size"] = max(0, int(line.split('=', 1)[1]))
+                    except ValueError:
+                        pass
+                elif line.startswith("reset_schedule="):
+                    settings["reset_schedule"] = line.split('=', 1)[1]
+                elif line.startswith("last_reset="):
+                    settings["last_reset"] = line.split('=', 1)[1]
+                i += 1
+            continue
+        elif line.startswith("[TASK]"):
+            if current_task:
+                tasks.append(current_task)
+            current_task = new_task("", [])
+            check_bits.append(0)
+        elif line.startswith("name=") and current_task is not None:
+            current_task["name"] = line[5:]
+        elif line.startswith("base_color=") and current_task is not None:
+            current_task["base_color"] = line[11:]
+        elif line.startswith("selected_color=") and current_task is not None:
+            current_task["selected_color"] = line[15:]
+        elif line.startswith("link=") and current_task is not None:
+            current_task["link"] = line[5:]
+        elif line.startswith("checks=") and current_task is not None:
+            try:
+                check_bits[-1] = int(line[7:], 16)
+            except ValueError:
+                pass
+        elif line.startswith("due=") and current_task is not None:
+            current_task["due"] = line[4:]
+        elif line.startswith("collapsed=") and current_task is not None:
+            current_task["collapsed"] = line[10:].lower() == "true"
+        elif line.startswith("sub_task=") and current_task is not None:
+            current_task["sub_tasks"].append(line[9:])
+            current_task["sub_task_dues"].append("")
+        elif line.startswith("sub_task_due=") and current_task is not None and current_task["sub_tasks"]:
+            current_task["sub_task_dues"][-1] = line[13:]
+        i += 1
+
+    if current_task:
+        tasks.append(current_task)
+
+    return tasks, settings, check_bits
+
+def load_todo_file(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return parse_todo_lines(f.readlines())
+
+def format_todo(tasks, settings, checks=None):
+    parts = [
+        "[SETTINGS]\n",
+        f"title={settings['title']}\n",
+        f"font_size={settings['font_size']}\n",
+        f"strikethrough={settings['strikethrough']}\n"
+    ]
+    for key in ("theme", "render_mode"):
+        value = settings.get(key, DEFAULT_SETTINGS[key])
+        if value != DEFAULT_SETTINGS[key]:
+            parts.append(f"{key}={value}\n")
+    for key in ("undo_memory_kb", "widget_pool_size"):
+        value = settings.get(key, DEFAULT_SETTINGS[key])
+        if value != DEFAULT_SETTINGS[key]:
+            parts.append(f"{key}={value}\n")
+    for key in ("reset_schedule", "last_reset"):
+        if settings.get(key):
+            parts.append(f"{key}={settings[key]}\n")
+    parts.append("\n")
+
+    for task_index, task in enumerate(tasks):
+        parts.append("[TASK]\n")
+        parts.append(f"name={task['name']}\n")
+        parts.append(f"base_color={task.get('base_color', 'default')}\n")
+        parts.append(f"selected_color={task.get('selected_color', 'default')}\n")
+        parts.append(f"link={task.get('link', '')}\n")
+        if task.get('due'):
+            parts.append(f"due={task['due']}\n")
+        if task.get('collapsed'):
+            parts.append("collapsed=True\n")
+        if checks is not None and checks.bits[task_index]:
+            parts.append(f"checks={checks.bits[task_index]:x}\n")
+        sub_task_dues = task.get('sub_task_dues', ())
+        for sub_index, sub_task in enumerate(task['sub_tasks']):
+            parts.append(f"sub_task={sub_task}\n")
+            if sub_index < len(sub_task_dues) and sub_task_dues[sub_index]:
+                parts.append(f"sub_task_due={sub_task_dues[sub_index]}\n")
+        parts.append("\n")
+
+    return "".join(parts)
+
+# Frozen builds must bundle web_html/ next to the icons, e.g. PyInstaller --add-data "web_html:web_html"
+WEB_TEMPLATE = os.path.join("web_html", "index.html")
+WEB_SETTING_KEYS = {
+    "title": "title",
+    "font_size": "fontSize",
+    "strikethrough": "strikethrough",
+    "theme": "theme",
+    "render_mode": "renderMode",
+    "undo_memory_kb": "undoMemoryKb",
+    "widget_pool_size": "widgetPoolSize",
+    "reset_schedule": "resetSchedule",
+    "last_reset": "lastReset"
+}
+WEB_TASK_FIELDS = (
+    ("base_color", "baseColor", "default"),
+    ("selected_color", "selectedColor", "default"),
+    ("link", "link", ""),
+    ("due", "due", ""),
+    ("collapsed", "collapsed", False)
+)
+WEB_ASSET_PATTERN = re.compile(r'(src|href)="([\w.-]+\.(?:png|ico))"')
+
+def export_list_data(tasks, settings, checks, file_path=None):
+    # Compact rows for the web page: [name, sub_tasks, check bits in hex, non-default fields]
+    rows = []
+    for task_index, task in enumerate(tasks):
+        bits = checks.bits[task_index]
+        row = [task['name'], task['sub_tasks'], f"{bits:x}" if bits else ""]
+        extra = {web_key: task[key] for key, web_key, default in WEB_TASK_FIELDS
+                 if task.get(key, default) != default}
+        if any(task.get('sub_task_dues', ())):
+            extra["subTaskDues"] = task['sub_task_dues']
+        if extra:
+            row.append(extra)
+        rows.append(row)
+    return {
+        "fileName": os.path.basename(file_path) if file_path else None,
+        "settings": {web_key: settings.get(key, DEFAULT_SETTINGS[key]) for key, web_key in WEB_SETTING_KEYS.items()},
+        "tasks": rows
+    }
+
+def _inline_asset(match, base_dir):
+    path = os.path.join(base_dir, match.group(2))
+    if not os.path.exists(path):
+        return match.group(0)
+    mime_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    with open(path, 'rb') as f:
+        data = base64.b64encode(f.read()).decode('ascii')
+    return f'{match.group(1)}="data:{mime_type};base64,{data}"'
+
+def export_list_json(tasks, settings, checks, file_path=None):
+    # "<" only occurs inside JSON strings, so escaping it keeps "</script>" out of the page
+    return json.dumps(export_list_data(tasks, settings, checks, file_path),
+                      ensure_ascii=False, separators=(',', ':')).replace("<", "\\u003c")
+
+def format_standalone_html(payload, title, minify=False, live_api=None, live_token=None):
+    template_path = resource_path(WEB_TEMPLATE)
+    with open(template_path, 'r', encoding='utf-8') as f:
+        page = f.read()
+
+    if live_api:
+        source = f'data-live-api="{live_api}" data-live-token="{html.escape(live_token or "")}"'
+    else:
+        source = f'data-list-id="{hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]}"'
+    embedded = f'<script type="application/json" id="embeddedList" {source}>{payload}</script>\n'
+
+    page = WEB_ASSET_PATTERN.sub(lambda match: _inline_asset(match, os.path.dirname(template_path)), page)
+    page = re.sub(r"<title>.*?</title>", lambda _: f"<title>{html.escape(title)}</title>", page, count=1)
+    if minify:
+        page = "\n".join(line.strip() for line in page.splitlines() if line.strip()) + "\n"
+    script_start = page.rfind("<script>")
+    line_start = page.rfind("\n", 0, script_start) + 1
+    return page[:line_start] + page[line_start:script_start] + embedded + page[line_start:]
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+SCHEDULE_EPOCH = date(2000, 1, 3)
+MAX_TIMER_MS = 2 ** 31 - 1
+
+def parse_reset_schedule(text):
+    rules = []
+    for part in text.split(';'):
+        words = part.lower().split()
+        if not words:
+            continue
+        try:
+            at = datetime.strptime(words[-1], "%H:%M").time()
+            if words[0] == "daily" and len(words) == 2:
+                anchor, period = SCHEDULE_EPOCH, timedelta(days=1)
+            elif words[0] == "weekly" and len(words) == 3 and words[1][:3] in WEEKDAYS:
+                anchor, period = SCHEDULE_EPOCH + timedelta(days=WEEKDAYS.index(words[1][:3])), timedelta(days=7)
+            elif words[0] == "every" and len(words) == 3 and words[1].endswith("h") and int(words[1][:-1]) > 0:
+                anchor, period = SCHEDULE_EPOCH, timedelta(hours=int(words[1][:-1]))
+            else:
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"Invalid reset rule: {part.strip()}")
+        rules.append((datetime.combine(anchor, at), period))
+    return rules
+
+def next_occurrence(rule, after):
+    anchor, period = rule
+    return anchor + ((after - anchor) // period + 1) * period
+
+def last_occurrence(rule, moment):
+    anchor, period = rule
+    return anchor + ((moment - anchor) // period) * period
+
+def catch_up_reset(checks, settings, now=None):
+    try:
+        rules = parse_reset_schedule(settings.get('reset_schedule', ''))
+    except ValueError:
+        return False
+    if not rules:
+        return False
+    now = now or datetime.now()
+    try:
+        last_reset = datetime.fromisoformat(settings.get('last_reset', ''))
+    except ValueError:
+        settings['last_reset'] = now.isoformat(timespec='minutes')
+        return False
+    missed = max(last_occurrence(rule, now) for rule in rules)
+    if missed <= last_reset:
+        return False
+    checks.clear()
+    settings['last_reset'] = missed.isoformat(timespec='minutes')
+    return True
+
+def _task_cost(task):
+    return 200 + sum(len(value) for value in task.values() if isinstance(value, str)) + \
+        sum(64 + len(text) for text in task['sub_tasks']) + \
+        sum(8 + len(due) for due in task.get('sub_task_dues', ()))
+
+def _bit_count(bits):
+    return bin(bits).count("1")
+
+class CheckState:
+    def __init__(self, totals=()):
+        self.bits = [0] * len(totals)
+        self.counts = array('l', [0] * len(totals))
+        self.totals = array('l', totals)
+        self.checked_total = 0
+        self.total = sum(self.totals)
+
+    @classmethod
+    def for_tasks(cls, tasks, check_bits=None):
+        state = cls([len(task['sub_tasks']) for task in tasks])
+        for task_index, bits in enumerate(check_bits or ()):
+            if bits:
+                state.assign(task_index, bits & state.full_mask(task_index))
+        return state
+
+    def progress(self):
+        return self.checked_total, self.total
+
+    def task_progress(self, task_index):
+        return self.counts[task_index], self.totals[task_index]
+
+    def is_checked(self, task_index, sub_index):
+        return bool(self.bits[task_index] >> sub_index & 1)
+
+    def set(self, task_index, sub_index, checked):
+        mask = 1 << sub_index
+        bits = self.bits[task_index]
+        if bool(bits & mask) == checked:
+            return False
+        delta = 1 if checked else -1
+        self.bits[task_index] = bits ^ mask
+        self.counts[task_index] += delta
+        self.checked_total += delta
+        return True
+
+    def assign(self, task_index, bits):
+        count = _bit_count(bits)
+        self.checked_total += count - self.counts[task_index]
+        self.counts[task_index] = count
+        self.bits[task_index] = bits
+
+    def clear(self):
+        self.bits = [0] * len(self.bits)
+        self.counts = array('l', [0] * len(self.counts))
+        self.checked_total = 0
+
+    def full_mask(self, task_index):
+        return (1 << self.totals[task_index]) - 1
+
+    def insert_task(self, task_index, total, bits=0):
+        count = _bit_count(bits)
+        self.bits.insert(task_index, bits)
+        self.counts.insert(task_index, count)
+        self.totals.insert(task_index, total)
+        self.checked_total += count
+        self.total += total
+
+    def remove_task(self, task_index):
+        bits = self.bits.pop(task_index)
+        self.checked_total -= self.counts.pop(task_index)
+        self.total -= self.totals.pop(task_index)
+        return bits
+
+    def move_task(self, from_index, to_index):
+        bits = self.bits.pop(from_index)
+        count = self.counts.pop(from_index)
+        total = self.totals.pop(from_index)
+        self.bits.insert(to_index, bits)
+        self.counts.insert(to_index, count)
+        self.totals.insert(to_index, total)
+
+    def insert_subtask(self, task_index, sub_index, checked=False):
+        bits = self.bits[task_index]
+        low = bits & ((1 << sub_index) - 1)
+        self.bits[task_index] = low | ((bits >> sub_index) << (sub_index + 1)) | (int(checked) << sub_index)
+        self.totals[task_index] += 1
+        self.total += 1
+        if checked:
+            self.counts[task_index] += 1
+            self.checked_total += 1
+
+    def remove_subtask(self, task_index, sub_index):
+        bits = self.bits[task_index]
+        checked = bool(bits >> sub_index & 1)
+        low = bits & ((1 << sub_index) - 1)
+        self.bits[task_index] = low | ((bits >> (sub_index + 1)) << sub_index)
+        self.totals[task_index] -= 1
+        self.total -= 1
+        if checked:
+            self.counts[task_index] -= 1
+            self.checked_total -= 1
+        return checked
+
+class UndoCommand:
+    # Subclasses define redo(document) and undo(document); cost approximates their memory in bytes
+    def __init__(self, text, cost=64):
+        self.text = text
+        self.cost = cost
+
+class SetTaskFieldCommand(UndoCommand):
+    def __init__(self, task_index, field, old_value, new_value):
+        super().__init__(f"Change {field.replace('_', ' ')}", 96 + len(old_value) + len(new_value))
+        self.task_index = task_index
+        self.field = field
+        self.old_value = old_value
+        self.new_value = new_value
+
+    def redo(self, document):
+        document._set_task_field(self.task_index, self.field, self.new_value)
+
+    def undo(self, document):
+        document._set_task_field(self.task_index, self.field, self.old_value)
+
+class SetSubtaskFieldCommand(UndoCommand):
+    def __init__(self, task_index, sub_index, field, old_value, new_value):
+        super().__init__("Rename task" if field == 'sub_tasks' else "Change due date",
+                         96 + len(old_value) + len(new_value))
+        self.task_index = task_index
+        self.sub_index = sub_index
+        self.field = field
+        self.old_value = old_value
+        self.new_value = new_value
+
+    def redo(self, document):
+        document._set_subtask_field(self.task_index, self.sub_index, self.field, self.new_value)
+
+    def undo(self, document):
+        document._set_subtask_field(self.task_index, self.sub_index, self.field, self.old_value)
+
+class InsertTaskCommand(UndoCommand):
+    def __init__(self, task_index, task, bits=0):
+        super().__init__("Add To-Do", _task_cost(task))
+        self.task_index = task_index
+        self.task = task
+        self.bits = bits
+
+    def redo(self, document):
+        document._insert_task(self.task_index, self.task, self.bits)
+
+    def undo(self, document):
+        self.task, self.bits = document._remove_task(self.task_index)
+
+class RemoveTaskCommand(InsertTaskCommand):
+    def __init__(self, task_index, task):
+        super().__init__(task_index, task)
+        self.text = "Delete To-Do"
+
+    def redo(self, document):
+        InsertTaskCommand.undo(self, document)
+
+    def undo(self, document):
+        InsertTaskCommand.redo(self, document)
+
+class InsertSubtaskCommand(UndoCommand):
+    def __init__(self, task_index, sub_index, text, checked=False, due=""):
+        super().__init__("Add task", 96 + len(text) + len(due))
+        self.task_index = task_index
+        self.sub_index = sub_index
+        self.sub_text = text
+        self.checked = checked
+        self.due = due
+
+    def redo(self, document):
+        document._insert_subtask(self.task_index, self.sub_index, self.sub_text, self.checked, self.due)
+
+    def undo(self, document):
+        self.sub_text, self.checked, self.due = document._remove_subtask(self.task_index, self.sub_index)
+
+class RemoveSubtaskCommand(InsertSubtaskCommand):
+    def __init__(self, task_index, sub_index, text, due=""):
+        super().__init__(task_index, sub_index, text, due=due)
+        self.text = "Delete task"
+
+    def redo(self, document):
+        InsertSubtaskCommand.undo(self, document)
+
+    def undo(self, document):
+        InsertSubtaskCommand.redo(self, document)
+
+class MoveTaskCommand(UndoCommand):
+    def __init__(self, from_index, to_index):
+        super().__init__("Move To-Do")
+        self.from_index = from_index
+        self.to_index = to_index
+
+    def redo(self, document):
+        document._move_task(self.from_index, self.to_index)
+
+    def undo(self, document):
+        document._move_task(self.to_index, self.from_index)
+
+class SetCheckedCommand(UndoCommand):
+    def __init__(self, task_index, sub_index, checked):
+        super().__init__("Check task" if checked else "Uncheck task")
+        self.task_index = task_index
+        self.sub_index = sub_index
+        self.checked = checked
+
+    def redo(self, document):
+        document._set_checked(self.task_index, self.sub_index, self.checked)
+
+    def undo(self, document):
+        document._set_checked(self.task_index, self.sub_index, not self.checked)
+
+class SetChecksCommand(UndoCommand):
+    def __init__(self, text, changes):
+        super().__init__(text, 64 + sum(96 + (old_bits.bit_length() + new_bits.bit_length()) // 8
+                                        for _, old_bits, new_bits in changes))
+        self.changes = changes
+
+    def redo(self, document):
+        document._assign_checks([(task_index, new_bits) for task_index, _, new_bits in self.changes])
+
+    def undo(self, document):
+        document._assign_checks([(task_index, old_bits) for task_index, old_bits, _ in self.changes])
+
+class SetSettingsCommand(UndoCommand):
+    def __init__(self, old_settings, new_settings):
+        super().__init__("Change settings", 256 + len(old_settings['title']) + len(new_settings['title']))
+        self.old_settings = old_settings
+        self.new_settings = new_settings
+
+    def redo(self, document):
+        document._set_settings(self.new_settings)
+
+    def undo(self, document):
+        document._set_settings(self.old_settings)
+
+class CompoundCommand(UndoCommand):
+    def __init__(self, text, commands):
+        super().__init__(text, sum(command.cost for command in commands))
+        self.commands = commands
+
+    def redo(self, document):
+        for command in self.commands:
+            command.redo(document)
+
+    def undo(self, document):
+        for command in reversed(self.commands):
+            command.undo(document)
+
+class ReplaceDocumentCommand(UndoCommand):
+    def __init__(self, text, tasks, checks, settings, file_path):
+        super().__init__(text, None)
+        self.state = (tasks, checks, settings, file_path)
+
+    def redo(self, document):
+        self.state = document._replace(*self.state)
+        if self.cost is None:
+            self.cost = 256 + sum(_task_cost(task) for task in self.state[0])
+
+    def undo(self, document):
+        self.state = document._replace(*self.state)
+
+class UndoStack:
+    def __init__(self, document, memory_limit=DEFAULT_SETTINGS['undo_memory_kb'] * 1024):
+        self.document = document
+        self.memory_limit = memory_limit
+        self.memory = 0
+        self._undo = deque()
+        self._redo = []
+        self._held_depth = None
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo_text(self):
+        return self._undo[-1].text if self._undo else ""
+
+    def redo_text(self):
+        return self._redo[-1].text if self._redo else ""
+
+    def push(self, command):
+        command.redo(self.document)
+        for dropped in self._redo:
+            self.memory -= dropped.cost
+        self._redo.clear()
+        self._undo.append(command)
+        self.memory += command.cost
+        self._evict()
+        self.document.undo_state_changed.emit()
+
+    def undo(self):
+        if not self._undo:
+            return
+        command = self._undo.pop()
+        command.undo(self.document)
+        self._redo.append(command)
+        self.document.undo_state_changed.emit()
+
+    def redo(self):
+        if not self._redo:
+            return
+        command = self._redo.pop()
+        command.redo(self.document)
+        self._undo.append(command)
+        self.document.undo_state_changed.emit()
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self.memory = 0
+        self.document.undo_state_changed.emit()
+
+    def set_memory_limit(self, memory_limit):
+        self.memory_limit = memory_limit
+        self._evict()
+        self.document.undo_state_changed.emit()
+
+    def hold(self):
+        self._held_depth = len(self._undo)
+
+    def is_held(self):
+        return self._held_depth is not None
+
+    def release(self):
+        self._held_depth = None
+        self._evict()
+
+    def is_modified_since_hold(self):
+        return self._held_depth is not None and (len(self._undo) != self._held_depth or bool(self._redo))
+
+    def revert_to_hold(self):
+        if self._held_depth is None:
+            return
+        while len(self._undo) > self._held_depth:
+            self.undo()
+        for dropped in self._redo:
+            self.memory -= dropped.cost
+        self._redo.clear()
+        self.document.undo_state_changed.emit()
+
+    def _evict(self):
+        while self.memory > self.memory_limit and (self._redo or self._undo):
+            if self._redo and not self._undo:
+                self.memory -= self._redo.pop(0).cost
+                continue
+            if self._held_depth is not None:
+                if self._held_depth == 0:
+                    break
+                self._held_depth -= 1
+            self.memory -= self._undo.popleft().cost
+
+class TodoDocument(QObject):
+    document_reset = pyqtSignal()
+    structure_changed = pyqtSignal()
+    task_changed = pyqtSignal(int)
+    subtasks_changed = pyqtSignal(int)
+    check_changed = pyqtSignal(int, int, bool)
+    due_changed = pyqtSignal(int, int)
+    checks_reset = pyqtSignal(list)
+    collapse_changed = pyqtSignal(list)
+    settings_changed = pyqtSignal()
+    undo_state_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tasks = []
+        self.checks = CheckState()
+        self.settings = default_settings()
+        self.file_path = None
+        self.undo_stack = UndoStack(self)
+
+    def load(self, file_path):
+        tasks, settings, check_bits = load_todo_file(file_path)
+        checks = CheckState.for_tasks(tasks, check_bits)
+        catch_up_reset(checks, settings)
+        self.undo_stack.push(ReplaceDocumentCommand("Load list", tasks, checks, settings, file_path))
+
+    def save(self, file_path):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(format_todo(self.tasks, self.settings, self.checks))
+        self.file_path = file_path
+
+    def export_html(self, file_path, minify=False):
+        page = format_standalone_html(self.to_json(), self.settings['title'], minify)
+        with open(file_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(page)
+
+    def to_json(self):
+        return export_list_json(self.tasks, self.settings, self.checks, self.file_path)
+
+    def scheduled_reset(self, when):
+        # The reset and its timestamp are one step, so undo never leaves last_reset ahead of the checks
+        commands = [SetSettingsCommand(self.settings, dict(self.settings, last_reset=when.isoformat(timespec='minutes')))]
+        changes = self._reset_changes(None)
+        if changes:
+            commands.insert(0, SetChecksCommand("Reset checks", changes))
+        self.undo_stack.push(CompoundCommand("Scheduled reset", commands))
+
+    def unload(self):
+        self.undo_stack.push(ReplaceDocumentCommand("Remove file", [], CheckState(), default_settings(), None))
+
+    def clear_tasks(self):
+        self.undo_stack.push(ReplaceDocumentCommand("Reset To-Do", [], CheckState(), self.settings, self.file_path))
+
+    def set_settings(self, settings):
+        new_settings = dict(self.settings)
+        new_settings.update(settings)
+        if new_settings != self.settings:
+            self.undo_stack.push(SetSettingsCommand(self.settings, new_settings))
+
+    def set_task_field(self, task_index, field, value):
+        old_value = self.tasks[task_index].get(field, "")
+        if old_value != value:
+            self.undo_stack.push(SetTaskFieldCommand(task_index, field, old_value, value))
+
+    def set_subtask_text(self, task_index, sub_index, text):
+        old_text = self.tasks[task_index]['sub_tasks'][sub_index]
+        if old_text != text:
+            self.undo_stack.push(SetSubtaskFieldCommand(task_index, sub_index, 'sub_tasks', old_text, text))
+
+    def set_subtask_due(self, task_index, sub_index, due):
+        old_due = self.tasks[task_index]['sub_task_dues'][sub_index]
+        if old_due != due:
+            self.undo_stack.push(SetSubtaskFieldCommand(task_index, sub_index, 'sub_task_dues', old_due, due))
+
+    def add_task(self, task=None):
+        self.insert_task(len(self.tasks), task if task is not None else new_task())
+
+    def insert_task(self, task_index, task):
+        self.undo_stack.push(InsertTaskCommand(task_index, task))
+
+    def remove_task(self, task_index):
+        self.undo_stack.push(RemoveTaskCommand(task_index, self.tasks[task_index]))
+
+    def move_task(self, from_index, to_index):
+        if from_index != to_index and 0 <= to_index < len(self.tasks):
+            self.undo_stack.push(MoveTaskCommand(from_index, to_index))
+
+    def add_subtask(self, task_index, text="New task"):
+        self.insert_subtask(task_index, len(self.tasks[task_index]['sub_tasks']), text)
+
+    def insert_subtask(self, task_index, sub_index, text):
+        self.undo_stack.push(InsertSubtaskCommand(task_index, sub_index, text))
+
+    def remove_subtask(self, task_index, sub_index):
+        task = self.tasks[task_index]
+        self.undo_stack.push(RemoveSubtaskCommand(task_index, sub_index, task['sub_tasks'][sub_index],
+                                                  task['sub_task_dues'][sub_index]))
+
+    def is_checked(self, task_index, sub_index):
+        return self.checks.is_checked(task_index, sub_index)
+
+    def progress(self):
+        return self.checks.progress()
+
+    def task_progress(self, task_index):
+        return self.checks.task_progress(task_index)
+
+    def set_checked(self, task_index, sub_index, checked):
+        if self.checks.is_checked(task_index, sub_index) != checked:
+            self.undo_stack.push(SetCheckedCommand(task_index, sub_index, checked))
+
+    def _reset_changes(self, task_indices):
+        bits = self.checks.bits
+        if task_indices is None:
+            task_indices = range(len(bits))
+        return [(i, bits[i], 0) for i in task_indices if bits[i]]
+
+    def reset_checks(self, task_indices=None):
+        changes = self._reset_changes(task_indices)
+        if changes:
+            self.undo_stack.push(SetChecksCommand("Reset checks", changes))
+
+    def check_all(self, task_index):
+        old_bits = self.checks.bits[task_index]
+        new_bits = self.checks.full_mask(task_index)
+        if old_bits != new_bits:
+            self.undo_stack.push(SetChecksCommand("Check all", [(task_index, old_bits, new_bits)]))
+
+    def set_collapsed(self, task_indices, collapsed):
+        changed = [i for i in task_indices if self.tasks[i].get('collapsed', False) != collapsed]
+        for task_index in changed:
+            self.tasks[task_index]['collapsed'] = collapsed
+        if changed:
+            self.collapse_changed.emit(changed)
+
+    def undo(self):
+        self.undo_stack.undo()
+
+    def redo(self):
+        self.undo_stack.redo()
+
+    def _replace(self, tasks, checks, settings, file_path):
+        old_state = (self.tasks, self.checks, self.settings, self.file_path)
+        self.tasks = tasks
+        self.checks = checks
+        self.settings = settings
+        self.file_path = file_path
+        self.undo_stack.memory_limit = settings.get('undo_memory_kb', DEFAULT_SETTINGS['undo_memory_kb']) * 1024
+        self.document_reset.emit()
+        return old_state
+
+    def _set_settings(self, settings):
+        self.settings = settings
+        self.undo_stack.memory_limit = settings.get('undo_memory_kb', DEFAULT_SETTINGS['undo_memory_kb']) * 1024
+        self.settings_changed.emit()
+
+    def _set_task_field(self, task_index, field, value):
+        self.tasks[task_index][field] = value
+        self.task_changed.emit(task_index)
+        if field == 'due':
+            self.due_changed.emit(task_index, -1)
+
+    def _set_subtask_field(self, task_index, sub_index, field, value):
+        self.tasks[task_index][field][sub_index] = value
+        self.task_changed.emit(task_index)
+        if field == 'sub_task_dues':
+            self.due_changed.emit(task_index, sub_index)
+
+    def _insert_task(self, task_index, task, bits=0):
+        self.tasks.insert(task_index, task)
+        self.checks.insert_task(task_index, len(task['sub_tasks']), bits)
+        self.structure_changed.emit()
+
+    def _remove_task(self, task_index):
+        task = self.tasks.pop(task_index)
+        bits = self.checks.remove_task(task_index)
+        self.structure_changed.emit()
+        return task, bits
+
+    def _move_task(self, from_index, to_index):
+        self.tasks.insert(to_index, self.tasks.pop(from_index))
+        self.checks.move_task(from_index, to_index)
+        self.structure_changed.emit()
+
+    def _insert_subtask(self, task_index, sub_index, text, checked=False, due=""):
+        self.tasks[task_index]['sub_tasks'].insert(sub_index, text)
+        self.tasks[task_index]['sub_task_dues'].insert(sub_index, due)
+        self.checks.insert_subtask(task_index, sub_index, checked)
+        self.subtasks_changed.emit(task_index)
+
+    def _remove_subtask(self, task_index, sub_index):
+        text = self.tasks[task_index]['sub_tasks'].pop(sub_index)
+        due = self.tasks[task_index]['sub_task_dues'].pop(sub_index)
+        checked = self.checks.remove_subtask(task_index, sub_index)
+        self.subtasks_changed.emit(task_index)
+        return text, checked, due
+
+    def _set_checked(self, task_index, sub_index, checked):
+        self.checks.set(task_index, sub_index, checked)
+        self.check_changed.emit(task_index, sub_index, checked)
+
+    def _assign_checks(self, assignments):
+        for task_index, bits in assignments:
+            self.checks.assign(task_index, bits)
+        self.checks_reset.emit([task_index for task_index, _ in assignments])
+
+class ResetScheduler(QObject):
+    reset_due = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.heap = []
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.on_timeout)
+
+    def set_schedule(self, text):
+        try:
+            rules = parse_reset_schedule(text)
+        except ValueError:
+            rules = []
+        now = datetime.now()
+        self.heap = [(next_occurrence(rule, now), i, rule) for i, rule in enumerate(rules)]
+        heapq.heapify(self.heap)
+        self.arm()
+
+    def arm(self):
+        self.timer.stop()
+        if self.heap:
+            delay = (self.heap[0][0] - datetime.now()).total_seconds() * 1000
+            self.timer.start(int(min(max(delay, 0), MAX_TIMER_MS)))
+
+    def on_timeout(self):
+        now = datetime.now()
+        fired = None
+        while self.heap and self.heap[0][0] <= now:
+            due, i, rule = self.heap[0]
+            fired = due if fired is None else max(fired, due)
+            heapq.heapreplace(self.heap, (next_occurrence(rule, now), i, rule))
+        if fired is not None:
+            self.reset_due.emit(fired)
+        self.arm()
+
+class ReminderScheduler(QObject):
+    reminder_due = pyqtSignal(int, int)
+
+    def __init__(self, document, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self.heap = []
+        self.latest = {}
+        self.task_ids = {}
+        self.sequence = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.on_timeout)
+
+        document.document_reset.connect(self.rebuild)
+        document.structure_changed.connect(self.rebuild)
+        document.subtasks_changed.connect(self.reschedule_task)
+        document.due_changed.connect(self.on_due_changed)
+
+    def rebuild(self):
+        self.heap = []
+        self.latest = {}
+        self.task_ids = {id(task): i for i, task in enumerate(self.document.tasks)}
+        now = datetime.now()
+        for task in self.document.tasks:
+            self._schedule_task(task, now, self.heap.append)
+        heapq.heapify(self.heap)
+        self.arm()
+
+    def reschedule_task(self, task_index):
+        self._schedule_task(self.document.tasks[task_index], datetime.now(), self._push)
+        self.arm()
+
+    def on_due_changed(self, task_index, sub_index):
+        task = self.document.tasks[task_index]
+        due = task['due'] if sub_index < 0 else task['sub_task_dues'][sub_index]
+        self._schedule(task, sub_index, due, datetime.now(), self._push)
+        self.arm()
+
+    def _push(self, entry):
+        heapq.heappush(self.heap, entry)
+
+    def _schedule_task(self, task, now, add):
+        if task.get('due'):
+            self._schedule(task, -1, task['due'], now, add)
+        for sub_index, due in enumerate(task['sub_task_dues']):
+            if due or (id(task), sub_index) in self.latest:
+                self._schedule(task, sub_index, due, now, add)
+
+    def _schedule(self, task, sub_index, due, now, add):
+        self.sequence += 1
+        self.latest[(id(task), sub_index)] = self.sequence
+        when = parse_due(due)
+        if when is not None and when > now:
+            add((when, self.sequence, task, sub_index))
+
+    def arm(self):
+        self.timer.stop()
+        if self.heap:
+            delay = (self.heap[0][0] - datetime.now()).total_seconds() * 1000
+            self.timer.start(int(min(max(delay, 0), MAX_TIMER_MS)))
+
+    def on_timeout(self):
+        now = datetime.now()
+        while self.heap and self.heap[0][0] <= now:
+            when, sequence, task, sub_index = heapq.heappop(self.heap)
+            task_index = self.task_ids.get(id(task))
+            if self.latest.get((id(task), sub_index)) != sequence or task_index is None:
+                continue
+            dues = task['sub_task_dues']
+            due = task.get('due', '') if sub_index < 0 else dues[sub_index] if sub_index < len(dues) else ""
+            if parse_due(due) != when:
+                continue
+            if sub_index >= 0 and self.document.is_checked(task_index, sub_index):
+                continue
+            self.reminder_due.emit(task_index, sub_index)
+        self.arm()
+
+URL_SCHEMES = ("http://", "https://", "ftp://", "mailto:", "file://")
+
+def open_path(path):
+    if sys.platform.startswith("win"):
+        os.startfile(path)
+        return
+    command = ["open", path] if sys.platform == "darwin" else ["xdg-open", path]
+    process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        if process.wait(timeout=10) != 0:
+            raise OSError(f"{command[0]} exited with status {process.returncode}")
+    except subprocess.TimeoutExpired:
+        pass
+
+class PathStatusCache:
+    def __init__(self, ttl=30.0):
+        self.ttl = ttl
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def stat(self, path):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and now - entry[0] < self.ttl:
+                return entry[1]
+        try:
+            mtime = os.stat(path).st_mtime
+        except (OSError, ValueError):
+            mtime = None
+        with self.lock:
+            self.entries[path] = (now, mtime)
+        return mtime
+
+    def exists(self, path):
+        return self.stat(path) is not None
+
+    def invalidate(self, path):
+        with self.lock:
+            self.entries.pop(path, None)
+
+class LinkLauncher(QObject):
+    failed = pyqtSignal(str, str)
+    desktop_open_requested = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.path_cache = PathStatusCache()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self.desktop_open_requested.connect(self.open_with_desktop_services)
+
+    def open_with_desktop_services(self, path):
+        if not QDesktopServices.openUrl(QUrl.fromLocalFile(path)):
+            self.failed.emit(path, "no application is associated with this file")
+
+    def open(self, link):
+        self.pool.start(lambda: self._launch(link))
+
+    def _launch(self, link):
+        try:
+            if not link.lower().startswith(URL_SCHEMES) and self.path_cache.exists(link):
+                try:
+                    open_path(link)
+                except FileNotFoundError:
+                    self.desktop_open_requested.emit(link)
+            elif not webbrowser.open(link):
+                raise OSError("no browser available")
+        except Exception as e:
+            self.path_cache.invalidate(link)
+            self.failed.emit(link, str(e))
+
+def is_file_link(link):
+    return bool(link) and not link.lower().startswith(URL_SCHEMES) and not link.lower().startswith("www.")
+
+class LinkHealthChecker(QObject):
+    status_changed = pyqtSignal(str, bool)
+    checked = pyqtSignal(str, bool, int)
+
+    def __init__(self, document, path_cache, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self.path_cache = path_cache
+        self.results = {}
+        self.readable = {}
+        self.generation = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(4)
+
+        document.document_reset.connect(self.scan)
+        document.structure_changed.connect(self.scan)
+        document.task_changed.connect(self.check_task)
+        self.checked.connect(self.on_checked)
+
+    def status(self, link):
+        return self.results.get(link)
+
+    def scan(self):
+        self.generation += 1
+        links = {task.get('link', '') for task in self.document.tasks}
+        self.results = {link: ok for link, ok in self.results.items() if link in links}
+        for link in links:
+            if is_file_link(link):
+                self.submit(link)
+
+    def check_task(self, task_index):
+        link = self.document.tasks[task_index].get('link', '')
+        if is_file_link(link) and link not in self.results:
+            self.path_cache.invalidate(link)
+            self.submit(link)
+
+    def submit(self, link):
+        generation = self.generation
+        self.pool.start(lambda: self._check(link, generation))
+
+    def _check(self, link, generation):
+        if generation != self.generation:
+            return
+        mtime = self.path_cache.stat(link)
+        if mtime is None:
+            ok = False
+        else:
+            key = (link, mtime)
+            ok = self.readable.get(key)
+            if ok is None:
+                ok = self.readable[key] = os.access(link, os.R_OK)
+        self.checked.emit(link, ok, generation)
+
+    def on_checked(self, link, ok, generation):
+        if generation == self.generation and self.results.get(link) != ok:
+            self.results[link] = ok
+            self.status_changed.emit(link, ok)
+
+PER_FILE_ICON_EXTENSIONS = {".exe", ".lnk", ".ico", ".url", ".desktop", ".app"}
+
+class LinkIconLoader(QObject):
+    icon_ready = pyqtSignal(str, QIcon)
+    loaded = pyqtSignal(str, QIcon)
+
+    def __init__(self, parent=None, capacity=256):
+        super().__init__(parent)
+        self.capacity = capacity
+        self.cache = OrderedDict()
+        self.pending = {}
+        self.provider = QFileIconProvider()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self.loaded.connect(self.on_loaded)
+
+    @staticmethod
+    def cache_key(link):
+        extension = os.path.splitext(link)[1].lower()
+        return link if not extension or extension in PER_FILE_ICON_EXTENSIONS else extension
+
+    def request(self, link):
+        key = self.cache_key(link)
+        icon = self.cache.get(key)
+        if icon is not None:
+            self.cache.move_to_end(key)
+            return icon
+        if key in self.pending:
+            self.pending[key].add(link)
+        else:
+            self.pending[key] = {link}
+            self.pool.start(lambda: self.loaded.emit(key, self.provider.icon(QFileInfo(link))))
+        return None
+
+    def on_loaded(self, key, icon):
+        self.cache[key] = icon
+        while len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+        for link in self.pending.pop(key, ()):
+            self.icon_ready.emit(link, icon)
+
+LIVE_SERVER_HOST = "127.0.0.1"
+LIVE_SERVER_PORT = 8765
+LIVE_CLIENT_BACKLOG = 256
+LIVE_KEEPALIVE_SECONDS = 15
+MAX_REQUEST_BODY = 16 * 1024 * 1024
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    415: "Unsupported Media Type",
+    500: "Internal Server Error"
+}
+
+class HttpError(Exception):
+    def __init__(self, status, message, details=None):
+        super().__init__(message)
+        self.status = status
+        self.details = details or {}
+
+def api_token_path():
+    # Per-user location; the file only exists while the server runs
+    return os.path.join(os.environ.get("XDG_RUNTIME_DIR") or os.path.expanduser("~"), ".simply-todotask-token")
+
+def is_loopback_host(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+def read_json(body):
+    try:
+        return json.loads(body or b"null")
+    except ValueError as e:
+        raise HttpError(400, f"Invalid JSON: {e}")
+
+def read_object(body):
+    data = read_json(body)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise HttpError(400, "Expected a JSON object")
+    return data
+
+def clean_text(value, field):
+    # The list format is line based, so names cannot span lines
+    if not isinstance(value, str) or not value.strip() or "\n" in value or "\r" in value:
+        raise HttpError(400, f"{field} must be a non-empty single line")
+    return value
+
+def json_response(data):
+    return "application/json", json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class LiveServer(QObject):
+    # The server runs its own asyncio loop on a thread; every document access
+    # is handed to the Qt thread through call_requested and awaited as a future.
+    call_requested = pyqtSignal(object, object)
+
+    def __init__(self, document, parent=None, token_path=None):
+        super().__init__(parent)
+        self.document = document
+        self.token_path = token_path
+        self.loop = None
+        self.thread = None
+        self.server = None
+        self.url = None
+        self.token = None
+        self.allowed_hosts = None
+        self.clients = set()
+        self.reload_pending = False
+        self.socket_path = None
+        self.operations = {
+            "check": self.apply_check,
+            "add_task": self.apply_add_task,
+            "add_subtask": self.apply_add_subtask,
+            "reset": self.apply_reset
+        }
+        self.routes = {
+            ("GET", "/"): self.get_page,
+            ("GET", "/api/list"): self.get_list,
+            ("GET", "/api/tasks"): self.get_tasks,
+            ("POST", "/api/check"): lambda query, body: self.post_operation(self.apply_check, body),
+            ("POST", "/api/tasks"): lambda query, body: self.post_operation(self.apply_add_task, body),
+            ("POST", "/api/subtasks"): lambda query, body: self.post_operation(self.apply_add_subtask, body),
+            ("POST", "/api/reset"): lambda query, body: self.post_operation(self.apply_reset, body),
+            ("POST", "/api/batch"): lambda query, body: self.post_operation(self.apply_batch, body)
+        }
+        self.call_requested.connect(self.run_call)
+        document.check_changed.connect(self.on_check_changed)
+        document.checks_reset.connect(self.on_checks_reset)
+        for signal in (document.document_reset, document.structure_changed, document.task_changed,
+                       document.subtasks_changed, document.settings_changed, document.collapse_changed):
+            signal.connect(self.schedule_reload)
+
+    def is_running(self):
+        return self.thread is not None
+
+    def start(self, address=None):
+        if self.thread is None:
+            ready = concurrent.futures.Future()
+            self.token = secrets.token_urlsafe(32)
+            self.loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(target=self._serve, args=(address, ready), daemon=True)
+            self.thread.start()
+            try:
+                self.url = ready.result()
+            except Exception:
+                self.thread.join()
+                self.loop = self.thread = None
+                raise
+            if self.token_path:
+                self.write_token()
+        return self.url
+
+    def stop(self):
+        if self.thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop = self.thread = self.server = self.url = self.socket_path = self.token = None
+            if self.token_path:
+                try:
+                    os.remove(self.token_path)
+                except OSError:
+                    pass
+
+    def write_token(self):
+        # Scripts read the session token from here; only the owner may read it
+        fd = os.open(self.token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(self.token)
+        os.chmod(self.token_path, 0o600)
+
+    def _serve(self, address, ready):
+        asyncio.set_event_loop(self.loop)
+        try:
+            url = self.loop.run_until_complete(self._listen(address))
+        except Exception as e:
+            self.loop.close()
+            ready.set_exception(e)
+            return
+        ready.set_result(url)
+        self.loop.run_forever()
+
+        self.server.close()
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+        if self.socket_path:
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
+
+    async def _listen(self, address):
+        # address is "host:port", ":port" or a Unix socket path; None means the default port
+        if address and "/" in address:
+            if os.path.exists(address) and stat.S_ISSOCK(os.stat(address).st_mode):
+                os.remove(address)
+            self.server = await asyncio.start_unix_server(self.handle_connection, address)
+            os.chmod(address, 0o600)
+            self.socket_path = address
+            # Browsers cannot reach a Unix socket, so there is no Host to check
+            self.allowed_hosts = None
+            return f"unix:{address}"
+        if address:
+            host, _, port = address.rpartition(":")
+            host = host.strip("[]") or LIVE_SERVER_HOST
+            if not is_loopback_host(host):
+                raise ValueError(f"{host} is not a loopback address")
+            self.server = await asyncio.start_server(self.handle_connection, host, int(port))
+        else:
+            host = LIVE_SERVER_HOST
+            try:
+                self.server = await asyncio.start_server(self.handle_connection, host, LIVE_SERVER_PORT)
+            except OSError:
+                # The usual port is taken, e.g. by another instance: let the system pick one
+                self.server = await asyncio.start_server(self.handle_connection, host, 0)
+        port = self.server.sockets[0].getsockname()[1]
+        # Requests must name this server, which stops DNS rebinding from reading the list
+        host = f"[{host}]" if ":" in host else host
+        self.allowed_hosts = {f"{name}:{port}" for name in (host, "localhost", "127.0.0.1", "[::1]")}
+        return f"http://{host}:{port}/"
+
+    def run_call(self, func, future):
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(func())
+            except Exception as e:
+                future.set_exception(e)
+
+    async def call(self, func):
+        future = concurrent.futures.Future()
+        self.call_requested.emit(func, future)
+        return await asyncio.wrap_future(future)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except HttpError as e:
+                    await self.send(writer, e.status, *json_response({"error": str(e), **e.details}), False)
+                    break
+                if request is None:
+                    break
+                method, path, query, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    self.authorize(method, path, query, headers)
+                    if (method, path) == ("GET", "/api/events"):
+                        await self.stream_events(writer)
+                        break
+                    handler = self.routes.get((method, path))
+                    if handler is None:
+                        known = any(route_path == path for _, route_path in self.routes)
+                        raise HttpError(405 if known else 404, f"No route for {method} {path}")
+                    status, (content_type, payload) = 200, await handler(query, body)
+                except HttpError as e:
+                    status, (content_type, payload) = e.status, json_response({"error": str(e), **e.details})
+                except Exception as e:
+                    status, (content_type, payload) = 500, json_response({"error": str(e)})
+                await self.send(writer, status, content_type, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # stop() cancels open connections; end quietly instead of as a failed stream callback
+            pass
+        finally:
+            writer.close()
+
+    def authorize(self, method, path, query, headers):
+        if self.allowed_hosts is not None and headers.get("host", "").lower() not in self.allowed_hosts:
+            raise HttpError(403, "Unknown Host")
+        origin = headers.get("origin")
+        if origin is not None and (self.allowed_hosts is None
+                                   or origin.lower() not in {f"http://{host}" for host in self.allowed_hosts}):
+            raise HttpError(403, "Cross-origin requests are not allowed")
+        if method == "POST" and headers.get("content-type", "").split(";")[0].strip().lower() != "application/json":
+            raise HttpError(415, "POST bodies must be application/json")
+        if path.startswith("/api/"):
+            # EventSource cannot send headers, so the token may also come in the query
+            scheme, _, token = headers.get("authorization", "").partition(" ")
+            if scheme.lower() != "bearer":
+                token = query.get("token", [""])[0]
+            if not hmac.compare_digest(token.encode('utf-8'), self.token.encode('utf-8')):
+                raise HttpError(401, "Missing or invalid API token")
+
+    async def read_request(self, reader):
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, _ = line.decode('latin-1').split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length")
+        if length > MAX_REQUEST_BODY:
+            raise HttpError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        url = urllib.parse.urlsplit(target)
+        return method.upper(), url.path, urllib.parse.parse_qs(url.query), headers, body
+
+    async def send(self, writer, status, content_type, payload, keep_alive):
+        writer.write((f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                      f"Content-Type: {content_type}\r\n"
+                      f"Content-Length: {len(payload)}\r\n"
+                      "Cache-Control: no-store\r\n"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode('latin-1') + payload)
+        await writer.drain()
+
+    async def stream_events(self, writer):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-store\r\n\r\n")
+        queue = asyncio.Queue(LIVE_CLIENT_BACKLOG)
+        self.clients.add(queue)
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), LIVE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    event = b": keepalive\n\n"
+                if event is None:
+                    break
+                writer.write(event)
+                await writer.drain()
+        finally:
+            self.clients.discard(queue)
+
+    def broadcast(self, name, data):
+        event = f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode('utf-8')
+        for queue in list(self.clients):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A client that stopped reading is dropped; the page reloads the list when it reconnects
+                self.clients.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def publish(self, name, data):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.broadcast, name, data)
+
+    def on_check_changed(self, task_index, sub_index, checked):
+        self.publish("check", {"task": task_index, "sub": sub_index, "checked": checked})
+
+    def on_checks_reset(self, task_indices):
+        bits = self.document.checks.bits
+        self.publish("checks", [[task_index, f"{bits[task_index]:x}" if bits[task_index] else ""]
+                                for task_index in task_indices])
+
+    def schedule_reload(self, *args):
+        if self.loop is not None and not self.reload_pending:
+            self.reload_pending = True
+            QTimer.singleShot(0, self.publish_reload)
+
+    def publish_reload(self):
+        self.reload_pending = False
+        self.publish("list", {})
+
+    def find_task(self, ref):
+        # Scripts may address tasks and subtasks by position or by their text
+        tasks = self.document.tasks
+        if isinstance(ref, int) and not isinstance(ref, bool) and 0 <= ref < len(tasks):
+            return ref
+        if isinstance(ref, str):
+            for task_index, task in enumerate(tasks):
+                if task['name'] == ref:
+                    return task_index
+        raise HttpError(404, f"No task {ref!r}")
+
+    def find_subtask(self, task_index, ref):
+        sub_tasks = self.document.tasks[task_index]['sub_tasks']
+        if isinstance(ref, int) and not isinstance(ref, bool) and 0 <= ref < len(sub_tasks):
+            return ref
+        if isinstance(ref, str) and ref in sub_tasks:
+            return sub_tasks.index(ref)
+        raise HttpError(404, f"No subtask {ref!r} in task {self.document.tasks[task_index]['name']!r}")
+
+    def describe_tasks(self, task_indices):
+        document = self.document
+        tasks = []
+        for task_index in task_indices:
+            task = document.tasks[task_index]
+            checked, total = document.task_progress(task_index)
+            tasks.append({
+                "index": task_index,
+                "name": task['name'],
+                "link": task.get('link', ""),
+                "due": task.get('due', ""),
+                "checked": checked,
+                "total": total,
+                "sub_tasks": [{"text": text, "checked": document.is_checked(task_index, sub_index),
+                               "due": task['sub_task_dues'][sub_index]}
+                              for sub_index, text in enumerate(task['sub_tasks'])]
+            })
+        checked, total = document.progress()
+        return {"title": document.settings['title'], "checked": checked, "total": total, "tasks": tasks}
+
+    def apply_check(self, data):
+        task_index = self.find_task(data.get("task"))
+        sub_index = self.find_subtask(task_index, data.get("sub"))
+        checked = data.get("checked")
+        checked = not self.document.is_checked(task_index, sub_index) if checked is None else bool(checked)
+        self.document.set_checked(task_index, sub_index, checked)
+        return {"task": task_index, "sub": sub_index, "checked": checked}
+
+    def apply_add_task(self, data):
+        sub_tasks = data.get("sub_tasks", [])
+        if not isinstance(sub_tasks, list):
+            raise HttpError(400, "sub_tasks must be a list")
+        task = new_task(clean_text(data.get("name"), "name"),
+                        [clean_text(text, "sub_tasks entry") for text in sub_tasks])
+        self.document.add_task(task)
+        return {"task": len(self.document.tasks) - 1}
+
+    def apply_add_subtask(self, data):
+        task_index = self.find_task(data.get("task"))
+        self.document.add_subtask(task_index, clean_text(data.get("text"), "text"))
+        return {"task": task_index, "sub": len(self.document.tasks[task_index]['sub_tasks']) - 1}
+
+    def apply_reset(self, data):
+        refs = data.get("tasks")
+        if refs is not None and not isinstance(refs, list):
+            raise HttpError(400, "tasks must be a list")
+        self.document.reset_checks(None if refs is None else [self.find_task(ref) for ref in refs])
+        checked, total = self.document.progress()
+        return {"checked": checked, "total": total}
+
+    def apply_batch(self, data):
+        # All operations run in one Qt call, so no edit from the UI lands in between.
+        # The batch is all or nothing: on the first failure the earlier operations are undone.
+        operations = data.get("operations")
+        if not isinstance(operations, list):
+            raise HttpError(400, "operations must be a list")
+        undo_stack = self.document.undo_stack
+        undo_stack.hold()
+        try:
+            results = []
+            for position, operation in enumerate(operations):
+                apply = self.operations.get(operation.get("op")) if isinstance(operation, dict) else None
+                try:
+                    if apply is None:
+                        raise HttpError(400, "unknown op")
+                    results.append(apply(operation))
+                except HttpError as e:
+                    # A redo stack left intact means nothing was pushed, and it must survive
+                    if undo_stack.is_modified_since_hold() and not undo_stack.can_redo():
+                        undo_stack.revert_to_hold()
+                    raise HttpError(e.status, f"Operation {position}: {e}; nothing was applied",
+                                    {"index": position})
+        finally:
+            undo_stack.release()
+        return {"results": results}
+
+    async def get_page(self, query, body):
+        payload, title = await self.call(lambda: (self.document.to_json(), self.document.settings['title']))
+        page = format_standalone_html(payload, title, live_api="/api", live_token=self.token)
+        return "text/html; charset=utf-8", page.encode('utf-8')
+
+    async def get_list(self, query, body):
+        return "application/json", (await self.call(self.document.to_json)).encode('utf-8')
+
+    async def get_tasks(self, query, body):
+        refs = query.get("task")
+
+        def describe():
+            if refs is None:
+                return self.describe_tasks(range(len(self.document.tasks)))
+            return self.describe_tasks([self.find_task(int(ref) if ref.isdigit() else ref) for ref in refs])
+        return json_response(await self.call(describe))
+
+    async def post_operation(self, apply, body):
+        data = read_object(body)
+
+        def run():
+            # Edits made while the Customize dialog is open would be reverted by its Cancel
+            if self.document.undo_stack.is_held():
+                raise HttpError(409, "The list is being customized; try again later")
+            return apply(data)
+        return json_response(await self.call(run))
+
+class InstanceServer(QObject):
+    files_received = pyqtSignal(list)
+    serve_requested = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self.on_new_connection)
+
+    def listen(self):
+        name = instance_server_name()
+        if self.server.listen(name):
+            return True
+        probe = QLocalSocket()
+        probe.connectToServer(name)
+        if probe.waitForConnected(INSTANCE_TIMEOUT_MS):
+            # Another instance is alive and answering; leave its server alone
+            probe.disconnectFromServer()
+            return False
+        # Nobody answers, so the socket file was left behind by an instance that crashed
+        QLocalServer.removeServer(name)
+        return self.server.listen(name)
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda socket=socket: self.read_message(socket))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def read_message(self, socket):
+        if not socket.canReadLine():
+            return
+        try:
+            message = json.loads(bytes(socket.readLine()).decode('utf-8'))
+        except ValueError:
+            message = None
+        socket.disconnectFromServer()
+        if not isinstance(message, dict) or not isinstance(message.get("files"), list):
+            return
+        self.files_received.emit([path for path in message["files"] if isinstance(path, str)])
+        if isinstance(message.get("serve"), str):
+            self.serve_requested.emit(message["serve"])
+
+class Toast(QLabel):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.messages = []
+        self.setWordWrap(True)
+        self.setObjectName("toast")
+        self.setAutoFillBackground(True)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.hide_timer = QTimer(self)
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.timeout.connect(self.dismiss)
+        self.hide()
+
+    def add_message(self, text):
+        self.messages.append(text)
+        shown = self.messages[-5:]
+        hidden = len(self.messages) - len(shown)
+        self.setText("\n".join((["…and {} more".format(hidden)] if hidden else []) + shown))
+        self.reposition()
+        self.show()
+        self.raise_()
+        self.hide_timer.start(10000)
+
+    def reposition(self):
+        parent = self.parentWidget()
+        width = min(420, parent.width() - 40)
+        self.setFixedWidth(width)
+        self.adjustSize()
+        self.move((parent.width() - width) // 2, parent.height() - self.height() - 20)
+
+    def dismiss(self):
+        self.messages = []
+        self.hide()
+
+    def mousePressEvent(self, event):
+        self.dismiss()
+
+THEMES = {
+    "light": {
+        "window": "#f8f9fa",
+        "surface": "#ffffff",
+        "surface_alt": "#f8f9fa",
+        "border": "#e0e0e0",
+        "input_border": "#cccccc",
+        "text": "#333333",
+        "text_strong": "#1a1a1a",
+        "text_muted": "#555555",
+        "text_faint": "#666666",
+        "text_hint": "#888888",
+        "accent": "#2E86AB",
+        "highlight": "#e3f2fd",
+        "highlight_border": "#bbdefb",
+        "file_box": "#f5f5f5",
+        "track": "#eeeeee",
+        "scroll_track": "#f0f0f0",
+        "scroll_handle": "#c0c0c0",
+        "scroll_handle_hover": "#a0a0a0",
+        "tab": "#e0e0e0",
+        "tab_hover": "#d0d0d0",
+        "toast": "#333333",
+        "header": "#2E86AB",
+        "primary": "#2196F3",
+        "success": "#4CAF50",
+        "danger": "#f44336",
+        "warning": "#FF9800",
+        "neutral": "#757575",
+        "muted": "#9E9E9E",
+        "light": "#E0E0E0",
+        "light_text": "#333333",
+        "dark": "#333333",
+    },
+    "dark": {
+        "window": "#1e1f22",
+        "surface": "#2b2d31",
+        "surface_alt": "#25272b",
+        "border": "#3a3d42",
+        "input_border": "#4a4d52",
+        "text": "#e3e3e3",
+        "text_strong": "#f2f2f2",
+        "text_muted": "#b5b5b5",
+        "text_faint": "#9a9a9a",
+        "text_hint": "#8a8a8a",
+        "accent": "#4FA3C7",
+        "highlight": "#1f3a4d",
+        "highlight_border": "#2b5573",
+        "file_box": "#25272b",
+        "track": "#3a3d42",
+        "scroll_track": "#26282c",
+        "scroll_handle": "#4a4d52",
+        "scroll_handle_hover": "#5c6066",
+        "tab": "#33363b",
+        "tab_hover": "#3f4247",
+        "toast": "#111214",
+        "header": "#1f6f8f",
+        "primary": "#2196F3",
+        "success": "#4CAF50",
+        "danger": "#f44336",
+        "warning": "#FF9800",
+        "neutral": "#616161",
+        "muted": "#757575",
+        "light": "#3a3d42",
+        "light_text": "#e3e3e3",
+        "dark": "#111214",
+    },
+}
+
+FONT_SIZES = {"small": 12, "medium": 14, "large": 16}
+
+RENDER_MODES = ("standard", "lite")
+
+BUILD_BATCH_SECONDS = 0.008
+
+BUTTON_VARIANTS = ("primary", "success", "danger", "warning", "neutral", "muted", "light", "dark")
+
+CHECK_MARK = ("url(\"data:image/svg+xml;utf8,<svg xmlns='http://www.w3.org/2000/svg' width='12' height='12' "
+              "viewBox='0 0 12 12'><path fill='white' d='M10.28 2.28L4.5 8.06 1.72 5.28a1 1 0 00-1.41 1.41l3.35 "
+              "3.36a1 1 0 001.41 0l6.36-6.36a1 1 0 10-1.41-1.41z'/></svg>\")")
+
+def theme_colors(theme):
+    return THEMES.get(theme, THEMES["light"])
+
+def darken_color(color, percent=15):
+    color = QColor(color)
+    r = max(0, color.red() - percent)
+    g = max(0, color.green() - percent)
+    b = max(0, color.blue() - percent)
+    return f"rgb({r}, {g}, {b})"
+
+def is_lite(settings):
+    return settings.get('render_mode') == "lite"
+
+def set_text_color(widget, color):
+    palette = widget.palette()
+    palette.setColor(QPalette.ColorRole.WindowText, QColor(color))
+    widget.setPalette(palette)
+
+def repolish(widget):
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+def theme_palette(theme):
+    p = theme_colors(theme)
+    palette = QPalette()
+    for role, key in (
+        (QPalette.ColorRole.Window, "window"),
+        (QPalette.ColorRole.WindowText, "text"),
+        (QPalette.ColorRole.Base, "surface"),
+        (QPalette.ColorRole.AlternateBase, "surface_alt"),
+        (QPalette.ColorRole.Text, "text"),
+        (QPalette.ColorRole.Button, "surface"),
+        (QPalette.ColorRole.ButtonText, "text"),
+        (QPalette.ColorRole.ToolTipBase, "surface"),
+        (QPalette.ColorRole.ToolTipText, "text"),
+        (QPalette.ColorRole.PlaceholderText, "text_hint"),
+        (QPalette.ColorRole.Highlight, "primary"),
+        (QPalette.ColorRole.Link, "accent"),
+    ):
+        palette.setColor(role, QColor(p[key]))
+    palette.setColor(QPalette.ColorRole.HighlightedText, QColor("white"))
+    return palette
+
+@lru_cache(maxsize=None)
+def compile_stylesheet(theme):
+    p = theme_colors(theme)
+    buttons = "".join(f"""
+        ModernButton[variant="{variant}"] {{
+            background-color: {p[variant]};
+            color: {p.get(variant + '_text', 'white')};
+        }}
+        ModernButton[variant="{variant}"]:hover {{
+            background-color: {darken_color(p[variant])};
+        }}
+        ModernButton[variant="{variant}"]:pressed {{
+            background-color: {darken_color(p[variant], 30)};
+        }}
+    """ for variant in BUTTON_VARIANTS)
+    return f"""
+        QMainWindow, QDialog {{
+            background-color: {p['window']};
+            font-family: "Segoe UI", Arial, sans-serif;
+        }}
+        QScrollBar:vertical {{
+            background-color: {p['scroll_track']};
+            width: 12px;
+            border-radius: 6px;
+            margin: 0px;
+        }}
+        QScrollBar::handle:vertical {{
+            background-color: {p['scroll_handle']};
+            border-radius: 6px;
+            min-height: 20px;
+        }}
+        QScrollBar::handle:vertical:hover {{
+            background-color: {p['scroll_handle_hover']};
+        }}
+        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+            border: none;
+            background: none;
+            height: 0px;
+        }}
+        QScrollArea {{
+            border: none;
+            background-color: transparent;
+        }}
+        QMenuBar {{
+            background-color: {p['surface']};
+            color: {p['text']};
+            border-bottom: 1px solid {p['border']};
+            padding: 4px;
+        }}
+        QMenuBar::item {{
+            padding: 6px 12px;
+            border-radius: 4px;
+        }}
+        QMenuBar::item:selected {{
+            background-color: {p['highlight']};
+        }}
+        QMenu {{
+            background-color: {p['surface']};
+            color: {p['text']};
+            border: 1px solid {p['input_border']};
+            border-radius: 6px;
+            padding: 4px;
+        }}
+        QMenu::item {{
+            padding: 6px 24px 6px 12px;
+        }}
+        QMenu::item:selected {{
+            background-color: {p['primary']};
+            color: white;
+            border-radius: 4px;
+        }}
+        QLabel {{
+            color: {p['text']};
+        }}
+        QLabel#toast {{
+            background-color: {p['toast']};
+            color: white;
+            border-radius: 8px;
+            padding: 10px 14px;
+            font-size: 12px;
+        }}
+        ModernButton {{
+            border: none;
+            border-radius: 8px;
+            font-weight: bold;
+            font-size: 12px;
+            padding: 8px 16px;
+        }}
+        {buttons}
+        ModernCard {{
+            background-color: {p['surface']};
+            border: 1px solid {p['border']};
+            border-radius: 12px;
+            margin: 8px 8px 8px 8px;
+            padding: 0px;
+        }}
+        ModernCard ModernCard {{
+            background-color: {p['surface_alt']};
+        }}
+        QFrame#header {{
+            background-color: {p['header']};
+            border-radius: 12px;
+            padding: 0px;
+        }}
+        QLabel#headerTitle {{
+            color: white;
+            font-size: 20px;
+            font-weight: bold;
+            padding: 5px 0px;
+        }}
+        QLabel#headerIcon {{
+            font-size: 24px;
+            color: white;
+        }}
+        QProgressBar#headerProgress {{
+            background-color: rgba(255, 255, 255, 60);
+            border: none;
+            border-radius: 8px;
+            color: white;
+            font-size: 10px;
+            font-weight: bold;
+            text-align: center;
+        }}
+        QProgressBar#headerProgress::chunk {{
+            background-color: {p['success']};
+            border-radius: 8px;
+        }}
+        QLabel#taskTitle {{
+            color: {p['text_strong']};
+            padding: 4px 0px;
+        }}
+        QLabel#taskTitle[link="true"] {{
+            color: {p['accent']};
+        }}
+        QLabel#subtask {{
+            color: {p['text']};
+            padding: 2px 0px;
+        }}
+        QLabel#subtask[checked="true"] {{
+            color: {p['success']};
+        }}
+        QLabel#due {{
+            color: {p['text_hint']};
+        }}
+        QLabel#due[overdue="true"] {{
+            color: {p['danger']};
+        }}
+        QToolButton#collapseButton {{
+            color: {p['text_muted']};
+            background-color: transparent;
+            border: none;
+            font-size: 14px;
+        }}
+        QToolButton#collapseButton:hover {{
+            color: {p['accent']};
+        }}
+        QLabel#linkBadge {{
+            color: white;
+            background-color: {p['danger']};
+            border-radius: 6px;
+            padding: 2px 6px;
+            font-size: 10px;
+            font-weight: bold;
+        }}
+        QProgressBar#taskProgress {{
+            background-color: {p['track']};
+            border: none;
+            border-radius: 7px;
+            color: {p['text_muted']};
+            font-size: 9px;
+            text-align: center;
+        }}
+        QProgressBar#taskProgress::chunk {{
+            background-color: {p['success']};
+            border-radius: 7px;
+        }}
+        QCheckBox {{
+            color: {p['text']};
+            spacing: 8px;
+        }}
+        QCheckBox::indicator {{
+            width: 15px;
+            height: 15px;
+            border: 2px solid {p['input_border']};
+            border-radius: 4px;
+            background-color: {p['surface']};
+        }}
+        QCheckBox::indicator:checked {{
+            background-color: {p['success']};
+            border: 2px solid {p['success']};
+            image: {CHECK_MARK};
+        }}
+        QCheckBox::indicator:checked:hover {{
+            background-color: {darken_color(p['success'])};
+            border: 2px solid {darken_color(p['success'])};
+        }}
+        QCheckBox#settingCheck {{
+            font-size: 12px;
+            font-weight: bold;
+        }}
+        QCheckBox#settingCheck::indicator {{
+            width: 18px;
+            height: 18px;
+            border-radius: 3px;
+        }}
+        QLineEdit {{
+            padding: 8px 12px;
+            border: 1px solid {p['input_border']};
+            border-radius: 6px;
+            font-size: 12px;
+            background-color: {p['surface']};
+            color: {p['text']};
+        }}
+        QLineEdit:focus {{
+            border-color: {p['primary']};
+        }}
+        QLineEdit#subtaskEdit {{
+            font-size: 11px;
+        }}
+        QLineEdit#dueEdit {{
+            padding: 8px 10px;
+            font-size: 11px;
+        }}
+        QLineEdit[invalid="true"], QLineEdit[invalid="true"]:focus {{
+            border-color: {p['danger']};
+        }}
+        QComboBox {{
+            padding: 8px 12px;
+            border: 1px solid {p['input_border']};
+            border-radius: 6px;
+            font-size: 12px;
+            background-color: {p['surface']};
+            color: {p['text']};
+            min-width: 120px;
+        }}
+        QComboBox:focus {{
+            border-color: {p['primary']};
+        }}
+        QComboBox::drop-down {{
+            border: none;
+            width: 20px;
+        }}
+        QComboBox::down-arrow {{
+            width: 12px;
+            height: 12px;
+        }}
+        QComboBox QAbstractItemView {{
+            background-color: {p['surface']};
+            border: 1px solid {p['input_border']};
+            border-radius: 6px;
+            outline: none;
+            padding: 4px;
+        }}
+        QComboBox QAbstractItemView::item {{
+            padding: 8px 12px;
+            border: none;
+            color: {p['text']};
+        }}
+        QComboBox QAbstractItemView::item:selected {{
+            background-color: {p['primary']};
+            color: white;
+        }}
+        QComboBox QAbstractItemView::item:hover {{
+            background-color: {p['highlight']};
+            color: {p['text']};
+        }}
+        QTabWidget::pane {{
+            border: 1px solid {p['scroll_handle']};
+            border-radius: 8px;
+            background-color: {p['surface']};
+            margin-top: 5px;
+        }}
+        QTabBar::tab {{
+            background-color: {p['tab']};
+            padding: 10px 20px;
+            margin-right: 3px;
+            border-top-left-radius: 6px;
+            border-top-right-radius: 6px;
+            font-weight: bold;
+            color: {p['text_muted']};
+        }}
+        QTabBar::tab:selected {{
+            background-color: {p['surface']};
+            color: {p['accent']};
+            border-bottom: 2px solid {p['accent']};
+        }}
+        QTabBar::tab:hover {{
+            background-color: {p['tab_hover']};
+        }}
+        QPushButton#moveButton {{
+            background-color: {p['light']};
+            color: {p['light_text']};
+            border: none;
+            border-radius: 6px;
+            font-size: 10px;
+        }}
+        QPushButton#moveButton:hover {{
+            background-color: {p['tab_hover']};
+        }}
+        QPushButton#deleteButton, QPushButton#deleteSubtaskButton {{
+            background-color: {p['danger']};
+            color: white;
+            border: none;
+            border-radius: 6px;
+            font-size: 10px;
+            font-weight: bold;
+        }}
+        QPushButton#deleteSubtaskButton {{
+            border-radius: 4px;
+            font-size: 9px;
+            font-weight: normal;
+        }}
+        QPushButton#deleteButton:hover, QPushButton#deleteSubtaskButton:hover {{
+            background-color: {darken_color(p['danger'], 30)};
+        }}
+        QPushButton#colorSwatch {{
+            border: 2px solid {p['input_border']};
+            border-radius: 6px;
+            background-color: {p['text_strong']};
+        }}
+        QPushButton#colorSwatch[kind="selected"] {{
+            background-color: {p['success']};
+        }}
+        QPushButton#colorSwatch:hover {{
+            border-color: {p['primary']};
+        }}
+        QLabel#logo {{
+            font-size: 48px;
+            color: {p['accent']};
+        }}
+        QLabel#welcomeTitle {{
+            font-size: 32px;
+            font-weight: bold;
+            color: {p['accent']};
+            padding: 10px;
+        }}
+        QLabel#welcomeText {{
+            font-size: 14px;
+            color: {p['text_muted']};
+        }}
+        QLabel#versionLabel {{
+            font-size: 11px;
+            font-weight: bold;
+        }}
+        QLabel#authorLabel {{
+            font-size: 11px;
+            color: {p['accent']};
+        }}
+        QLabel#githubLabel {{
+            font-size: 11px;
+            color: {p['text_faint']};
+        }}
+        QLabel#dateLabel {{
+            font-size: 10px;
+            color: {p['text_hint']};
+        }}
+        QLabel#dialogMessage {{
+            font-size: 14px;
+            font-weight: bold;
+        }}
+        QLabel#dialogTitle {{
+            font-size: 22px;
+            font-weight: bold;
+            color: {p['accent']};
+            padding: 10px 0px;
+        }}
+        QLabel#infoTitle {{
+            font-size: 20px;
+            font-weight: bold;
+            color: {p['accent']};
+            padding: 10px 0px;
+        }}
+        QLabel#fileInfo {{
+            font-size: 11px;
+            color: {p['text_faint']};
+            background-color: {p['highlight']};
+            padding: 8px 12px;
+            border-radius: 6px;
+            border: 1px solid {p['highlight_border']};
+        }}
+        QLabel#fileBox {{
+            font-size: 11px;
+            color: {p['text_faint']};
+            background-color: {p['file_box']};
+            padding: 10px 12px;
+            border-radius: 6px;
+            border: 1px solid {p['border']};
+        }}
+        QLabel#sectionTitle {{
+            font-size: 16px;
+            font-weight: bold;
+            color: {p['accent']};
+            padding-bottom: 5px;
+            border-bottom: 2px solid {p['border']};
+        }}
+        QLabel#fieldLabel {{
+            font-size: 12px;
+            font-weight: bold;
+        }}
+        QLabel#taskNumber {{
+            font-size: 14px;
+            font-weight: bold;
+            color: {p['accent']};
+        }}
+        QLabel#detailLabel {{
+            font-size: 11px;
+            font-weight: bold;
+            color: {p['text_muted']};
+        }}
+        QLabel#detailTitle {{
+            font-size: 12px;
+            font-weight: bold;
+            color: {p['text_muted']};
+            margin-bottom: 8px;
+        }}
+        QLabel#emptyLabel {{
+            font-size: 14px;
+            color: {p['text_faint']};
+            padding: 40px;
+            background-color: {p['surface']};
+            border-radius: 8px;
+            border: 2px dashed {p['input_border']};
+        }}
+        QFrame#infoCard {{
+            background-color: {p['surface']};
+            border-radius: 12px;
+            padding: 0px;
+        }}
+        QFrame#separator {{
+            background-color: {p['border']};
+            margin: 10px 0px;
+        }}
+        QLabel#infoText {{
+            font-size: 12px;
+        }}
+        QLabel#devInfo {{
+            font-size: 12px;
+            font-weight: bold;
+            color: {p['accent']};
+        }}
+        QLabel#versionInfo {{
+            font-size: 11px;
+            color: {p['text_faint']};
+        }}
+    """
+
+@lru_cache(maxsize=256)
+def task_color_stylesheet(base_color, selected_color):
+    parts = []
+    if base_color != 'default':
+        parts.append(f"QLabel#taskTitle {{ color: {base_color}; }}")
+    if selected_color != 'default':
+        parts.append(f"""
+            QLabel#subtask[checked="true"] {{ color: {selected_color}; }}
+            QProgressBar#taskProgress::chunk {{ background-color: {selected_color}; }}
+            QCheckBox::indicator:checked {{
+                background-color: {selected_color};
+                border: 2px solid {selected_color};
             }}
-            QPushButton:pressed {{
-                background-color: {self._darken_color(color, 30)};
+            QCheckBox::indicator:checked:hover {{
+                background-color: {darken_color(selected_color)};
+                border: 2px solid {darken_color(selected_color)};
             }}
         """)
+    return "".join(parts)
+
+def apply_theme(app, settings):
+    theme = settings.get('theme', DEFAULT_SETTINGS['theme'])
+    app.setPalette(theme_palette(theme))
+    app.setStyleSheet("" if is_lite(settings) else compile_stylesheet(theme))
+
+class ModernButton(QPushButton):
+    def __init__(self, text, variant="primary", icon=None, height=40):
+        super().__init__(text)
+        self.setFixedHeight(height)
+        self.setProperty("variant", variant)
         if icon:
             self.setIcon(QIcon(icon))
 
-    def _darken_color(self, color, percent=15):
-        try:
-            color = QColor(color)
-            r = max(0, color.red() - percent)
-            g = max(0, color.green() - percent)
-            b = max(0, color.blue() - percent)
-            return f"rgb({r}, {g}, {b})"
-        except:
-            return color
-
 class ModernCard(QFrame):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet("""
-            ModernCard {
-                background-color: white;
-                border: 1px solid #e0e0e0;
-                border-radius: 12px;
-                margin: 8px 8px 8px 8px;
-                padding: 0px;
-            }
-        """)
         self.setFrameStyle(QFrame.Shape.Box)
         self.setLineWidth(1)
 
+class WidgetPool:
+    def __init__(self, limit=DEFAULT_SETTINGS['widget_pool_size']):
+        self.limit = limit
+        self.size = 0
+        self.items = {}
+
+    def acquire(self, parent):
+        items = self.items.get(parent)
+        if not items:
+            items = next((items for items in self.items.values() if items), None)
+            if items is None:
+                return None
+        self.size -= 1
+        return items.pop()
+
+    def release(self, widget):
+        widget.hide()
+        if self.size < self.limit:
+            self.items.setdefault(widget.parentWidget(), []).append(widget)
+            self.size += 1
+            return True
+        widget.deleteLater()
+        return False
+
+    def discard(self, parent):
+        self.size -= len(self.items.pop(parent, ()))
+
+    def set_limit(self, limit):
+        self.limit = limit
+        dropped = []
+        for items in self.items.values():
+            while items and self.size > limit:
+                dropped.append(items.pop())
+                dropped[-1].deleteLater()
+                self.size -= 1
+        return dropped
+
+    def clear(self):
+        self.items.clear()
+        self.size = 0
+
+class ClickableLabel(QLabel):
+    pressed = pyqtSignal()
+
+    def mousePressEvent(self, event):
+        self.pressed.emit()
+
+class SubtaskRow(QFrame):
+    def __init__(self):
+        super().__init__()
+        self.card = None
+        self.sub_index = -1
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+
+        self.checkbox = QCheckBox()
+        self.checkbox.setFixedSize(20, 20)
+        self.checkbox.toggled.connect(self.on_toggled)
+
+        self.label = ClickableLabel()
+        self.label.setObjectName("subtask")
+        self.label.setProperty("checked", False)
+        self.label.setWordWrap(True)
+        self.label.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
+        self.label.pressed.connect(self.checkbox.toggle)
+
+        self.due_label = QLabel()
+        self.due_label.setObjectName("due")
+        self.due_label.setProperty("overdue", False)
+        self.due_label.hide()
+
+        layout.addWidget(self.checkbox)
+        layout.addWidget(self.label, 1)
+        layout.addWidget(self.due_label)
+
+    def on_toggled(self, checked):
+        self.card.on_row_toggled(self.sub_index, checked)
+
+    def bind(self, card, sub_index):
+        self.card = card
+        self.sub_index = sub_index
+        text = card.task_data['sub_tasks'][sub_index]
+        if self.label.text() != text:
+            self.label.setText(text)
+        card.set_due_label(self.due_label, card.task_data['sub_task_dues'][sub_index])
+        self.checkbox.blockSignals(True)
+        self.checkbox.setChecked(card.document.is_checked(card.index, sub_index))
+        self.checkbox.blockSignals(False)
+
+class LiteSubtaskRow(QCheckBox):
+    def __init__(self):
+        super().__init__()
+        self.card = None
+        self.sub_index = -1
+        self.checkbox = self.label = self
+        self.due_label = None
+        self.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Fixed)
+        self.toggled.connect(self.on_toggled)
+
+    def on_toggled(self, checked):
+        self.card.on_row_toggled(self.sub_index, checked)
+
+    def bind(self, card, sub_index):
+        self.card = card
+        self.sub_index = sub_index
+        text = card.task_data['sub_tasks'][sub_index]
+        due = card.task_data['sub_task_dues'][sub_index]
+        label = f"{text}   ⏰ {due}" if due else text
+        if self.text() != label:
+            self.setText(label)
+            self.setToolTip(text)
+        self.blockSignals(True)
+        self.setChecked(card.document.is_checked(card.index, sub_index))
+        self.blockSignals(False)
+
 class TaskCard(ModernCard):
-    def __init__(self, task_data, index, font_size=11, strikethrough=True):
+    link_activated = pyqtSignal(str)
+
+    def __init__(self, document, index, row_pool=None):
         super().__init__()
-        self.task_data = task_data
-        self.index = index
-        self.font_size = font_size
-        self.strikethrough = strikethrough
+        self.document = document
+        self.row_pool = row_pool if row_pool is not None else WidgetPool(0)
         self.subtask_vars = []
+        self.row_font = None
+        self.stale_rows = set()
+        self.link = None
         self.setup_ui()
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.show_context_menu)
+        self.bind(index)
+
+    def show_context_menu(self, pos):
+        menu = QMenu(self)
+        check_all_action = menu.addAction("Check all")
+        check_all_action.triggered.connect(lambda: self.document.check_all(self.index))
+        reset_action = menu.addAction("Reset checks")
+        reset_action.triggered.connect(lambda: self.document.reset_checks([self.index]))
+        menu.exec(self.mapToGlobal(pos))
+        menu.deleteLater()
+
+    def on_row_toggled(self, sub_index, checked):
+        self.update_subtask_style(self.subtask_vars[sub_index])
+        self.document.set_checked(self.index, sub_index, checked)
+
+    def mark_stale(self):
+        self.stale_rows = set(range(len(self.subtask_vars)))
+        self.update_progress()
+
+    def sync_visible(self, top, bottom):
+        rows = self.subtask_vars
+        low, high = 0, len(rows)
+        while low < high:
+            middle = (low + high) // 2
+            if rows[middle].geometry().bottom() < top:
+                low = middle + 1
+            else:
+                high = middle
+        for sub_index in range(low, len(rows)):
+            if rows[sub_index].y() > bottom:
+                break
+            if sub_index in self.stale_rows:
+                self.stale_rows.discard(sub_index)
+                self.set_checked(sub_index, self.document.is_checked(self.index, sub_index), False)
+        return not self.stale_rows
 
     def setup_ui(self):
+        self.lite = is_lite(self.document.settings)
         layout = QVBoxLayout(self)
-        layout.setContentsMargins(16, 16, 16, 16)
-        layout.setSpacing(10)
+        if self.lite:
+            self.setFrameShape(QFrame.Shape.NoFrame)
+            layout.setContentsMargins(8, 6, 8, 6)
+            layout.setSpacing(2)
+        else:
+            layout.setContentsMargins(16, 16, 16, 16)
+            layout.setSpacing(10)
 
-        title_frame = QFrame()
-        title_frame.setStyleSheet("background-color: transparent;")
-        title_layout = QHBoxLayout(title_frame)
+        title_layout = QHBoxLayout()
         title_layout.setContentsMargins(0, 0, 0, 0)
 
-        title_color = self.task_data.get('base_color', '#2E86AB')
-        if title_color == 'default':
-            title_color = '#2E86AB' if self.task_data.get('link') else '#1a1a1a'
-
-        title_font_size = self.font_size + 3
-
-        self.title_label = QLabel(self.task_data['name'])
-        self.title_label.setStyleSheet(f"""
-            QLabel {{
-                color: {title_color};
-                font-size: {title_font_size}px;
-                font-weight: bold;
-                background-color: transparent;
-                padding: 4px 0px;
-            }}
-        """)
+        self.collapse_button = QToolButton()
+        self.collapse_button.setObjectName("collapseButton")
+        self.collapse_button.setAutoRaise(True)
+        self.collapse_button.setFixedSize(20, 20)
+        self.collapse_button.clicked.connect(self.toggle_collapsed)
+        title_layout.addWidget(self.collapse_button)
+
+        self.icon_requested = False
+        self.icon_label = QLabel()
+        self.icon_label.setFixedSize(20, 20)
+        self.icon_label.hide()
+        title_layout.addWidget(self.icon_label)
+
+        self.title_label = ClickableLabel()
+        self.title_label.setObjectName("taskTitle")
+        self.title_label.setProperty("link", False)
         self.title_label.setWordWrap(True)
         self.title_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-
-        if self.task_data.get('link'):
-            self.title_label.setCursor(Qt.CursorShape.PointingHandCursor)
-            self.title_label.mousePressEvent = lambda e: self.open_task()
-
+        self.title_label.pressed.connect(self.open_task)
         title_layout.addWidget(self.title_label)
         title_layout.addStretch()
 
-        layout.addWidget(title_frame)
-
-        for i, subtask in enumerate(self.task_data['sub_tasks']):
-            self.create_subtask(layout, subtask, i)
-
-    def create_subtask(self, layout, text, index):
-        subtask_frame = QFrame()
-        subtask_frame.setStyleSheet("background-color: transparent;")
-        subtask_layout = QHBoxLayout(subtask_frame)
-        subtask_layout.setContentsMargins(0, 0, 0, 0)
-        subtask_layout.setSpacing(10)
-
-        checkbox = QCheckBox()
-        checkbox.setFixedSize(20, 20)
-        color = self.task_data.get('selected_color', '#4CAF50')
-        if color == 'default':
-            color = '#4CAF50'
-            
-        checkbox.setStyleSheet(f"""
-            QCheckBox {{
-                background-color: transparent;
-                spacing: 8px;
-            }}
-            QCheckBox::indicator {{
-                width: 15px;
-                height: 15px;
-                border: 2px solid #cccccc;
-                border-radius: 4px;
-                background-color: white;
-            }}
-            QCheckBox::indicator:checked {{
-                background-color: {color};
-                border: 2px solid {color};
-                image: url("data:image/svg+xml;utf8,<svg xmlns='http://www.w3.org/2000/svg' width='12' height='12' viewBox='0 0 12 12'><path fill='white' d='M10.28 2.28L4.5 8.06 1.72 5.28a1 1 0 00-1.41 1.41l3.35 3.36a1 1 0 001.41 0l6.36-6.36a1 1 0 10-1.41-1.41z'/></svg>");
-            }}
-            QCheckBox::indicator:checked:hover {{
-                background-color: {self._darken_color(color)};
-                border: 2px solid {self._darken_color(color)};
-            }}
-        """)
-        
-        subtask_label = QLabel(text)
-        subtask_label.setStyleSheet(f"""
-            QLabel {{
-                color: #333333;
-                font-size: {self.font_size}px;
-                background-color: transparent;
-                padding: 2px 0px;
-            }}
-        """)
-        subtask_label.setWordWrap(True)
-        subtask_label.setCursor(Qt.CursorShape.PointingHandCursor)
-        subtask_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-
-        subtask_widget = {
-            'checkbox': checkbox,
-            'label': subtask_label,
-            'original_text': text
-        }
-        self.subtask_vars.append(subtask_widget)
+        self.link_badge = QLabel("⚠️ Broken link")
+        self.link_badge.setObjectName("linkBadge")
+        self.link_badge.hide()
+        title_layout.addWidget(self.link_badge)
 
-        checkbox.stateChanged.connect(
-            lambda state, widget=subtask_widget: self.update_subtask_style(widget)
-        )
+        self.due_label = QLabel()
+        self.due_label.setObjectName("due")
+        self.due_label.setProperty("overdue", False)
+        self.due_label.hide()
+        title_layout.addWidget(self.due_label)
 
-        subtask_label.mousePressEvent = lambda e, cb=checkbox: cb.setChecked(not cb.isChecked())
+        layout.addLayout(title_layout)
 
-        subtask_layout.addWidget(checkbox)
-        subtask_layout.addWidget(subtask_label, 1)
-        layout.addWidget(subtask_frame)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setObjectName("taskProgress")
+        self.progress_bar.setFixedHeight(14)
+        self.progress_bar.setFormat("%v / %m")
+        layout.addWidget(self.progress_bar)
 
-    def _darken_color(self, color, percent=15):
-        try:
-            color = QColor(color)
-            r = max(0, color.red() - percent)
-            g = max(0, color.green() - percent)
-            b = max(0, color.blue() - percent)
-            return f"rgb({r}, {g}, {b})"
-        except:
-            return color
-
-    def update_subtask_style(self, widget):
-        checked = widget['checkbox'].isChecked()
-        color = self.task_data.get('selected_color', '#4CAF50')
-        if color == 'default':
-            color = '#4CAF50'
-
-        if checked and self.strikethrough:
-            widget['label'].setStyleSheet(f"""
-                QLabel {{
-                    color: {color};
-                    font-size: {self.font_size}px;
-                    text-decoration: line-through;
-                    background-color: transparent;
-                    padding: 2px 0px;
-                }}
-            """)
+    def bind(self, index):
+        settings = self.document.settings
+        self.index = index
+        self.task_data = self.document.tasks[index]
+        self.stale_rows = set()
+        base_color = self.task_data.get('base_color', 'default')
+        selected_color = self.task_data.get('selected_color', 'default')
+        self.checked_color = theme_colors(settings.get('theme'))['success'] if selected_color == 'default' else selected_color
+        if self.lite:
+            if base_color != 'default':
+                set_text_color(self.title_label, base_color)
+            elif self.title_label.testAttribute(Qt.WidgetAttribute.WA_SetPalette):
+                self.title_label.setPalette(QPalette())
+            if selected_color != 'default':
+                palette = self.progress_bar.palette()
+                palette.setColor(QPalette.ColorRole.Highlight, QColor(selected_color))
+                self.progress_bar.setPalette(palette)
+            elif self.progress_bar.testAttribute(Qt.WidgetAttribute.WA_SetPalette):
+                self.progress_bar.setPalette(QPalette())
         else:
-            widget['label'].setStyleSheet(f"""
-                QLabel {{
-                    color: {'#333333' if not checked else color};
-                    font-size: {self.font_size}px;
-                    background-color: transparent;
-                    padding: 2px 0px;
-                }}
-            """)
+            color_style = task_color_stylesheet(base_color, selected_color)
+            if self.styleSheet() != color_style:
+                self.setStyleSheet(color_style)
 
-    def open_task(self):
+        if self.title_label.text() != self.task_data['name']:
+            self.title_label.setText(self.task_data['name'])
         link = self.task_data.get('link', '')
-        if link:
-            try:
-                if os.path.exists(link):
-                    os.startfile(link)
-                else:
-                    webbrowser.open(link)
-            except Exception as e:
-                print(f"Error opening {link}: {e}")
+        if link != self.link:
+            self.link = link
+            self.icon_requested = False
+            self.icon_label.clear()
+            self.icon_label.hide()
+            self.link_badge.setToolTip(f"Cannot find {link}")
+            self.link_badge.hide()
+            if self.title_label.property("link") != bool(link):
+                self.title_label.setProperty("link", bool(link))
+                repolish(self.title_label)
+            if link:
+                self.title_label.setCursor(Qt.CursorShape.PointingHandCursor)
+            else:
+                self.title_label.unsetCursor()
+        self.set_due_label(self.due_label, self.task_data.get('due', ''))
+        self.bind_rows()
+        self.update_progress()
+        self.apply_settings()
+
+    def bind_rows(self):
+        self.stale_rows = set()
+        self.collapsed = self.task_data.get('collapsed', False)
+        self.collapse_button.setText("▸" if self.collapsed else "▾")
+        self.collapse_button.setToolTip("Expand" if self.collapsed else "Collapse")
+        row_count = 0 if self.collapsed else len(self.task_data['sub_tasks'])
+        while len(self.subtask_vars) > row_count:
+            self.row_pool.release(self.subtask_vars.pop())
+        layout = self.layout()
+        while len(self.subtask_vars) < row_count:
+            row = self.row_pool.acquire(self) or (LiteSubtaskRow() if self.lite else SubtaskRow())
+            if row.parentWidget() is not self:
+                layout.addWidget(row)
+            row.show()
+            self.subtask_vars.append(row)
+        for sub_index, row in enumerate(self.subtask_vars):
+            row.bind(self, sub_index)
+
+    def toggle_collapsed(self):
+        self.document.set_collapsed([self.index], not self.collapsed)
+
+    def update_collapsed(self):
+        self.bind_rows()
+        self.apply_settings()
+
+    def apply_settings(self):
+        settings = self.document.settings
+        font_size = FONT_SIZES.get(settings.get('font_size'), 14)
+        self.strikethrough = settings.get('strikethrough', True)
+        self.row_font = QFont()
+        self.row_font.setPixelSize(font_size)
+        self.done_font = QFont(self.row_font)
+        self.done_font.setStrikeOut(self.strikethrough)
+        for row in self.subtask_vars:
+            self.update_subtask_style(row)
+        title_font = QFont()
+        title_font.setPixelSize(font_size + 3)
+        title_font.setBold(True)
+        if self.lite and self.link:
+            title_font.setUnderline(True)
+        self.title_label.setFont(title_font)
+        due_font = QFont()
+        due_font.setPixelSize(max(font_size - 3, 9))
+        self.due_label.setFont(due_font)
+        if not self.lite:
+            for row in self.subtask_vars:
+                row.due_label.setFont(due_font)
+
+    def update_progress(self):
+        checked, total = self.document.task_progress(self.index)
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(checked)
+
+    def set_due_label(self, due_label, due):
+        if due:
+            when = parse_due(due)
+            due_label.setText(f"⏰ {format_due(when) if when else due}")
+            overdue = when is not None and when <= datetime.now()
+            if due_label.property("overdue") != overdue:
+                due_label.setProperty("overdue", overdue)
+                repolish(due_label)
+        due_label.setVisible(bool(due))
+
+    def set_checked(self, sub_index, checked, update_progress=True):
+        self.stale_rows.discard(sub_index)
+        row = self.subtask_vars[sub_index] if sub_index < len(self.subtask_vars) else None
+        if row is not None and row.checkbox.isChecked() != checked:
+            row.checkbox.blockSignals(True)
+            row.checkbox.setChecked(checked)
+            row.checkbox.blockSignals(False)
+            self.update_subtask_style(row)
+        if update_progress:
+            self.update_progress()
+
+    def update_subtask_style(self, row):
+        label = row.label
+        checked = row.checkbox.isChecked()
+        if self.row_font is not None:
+            label.setFont(self.done_font if checked else self.row_font)
+        if self.lite:
+            if checked:
+                set_text_color(label, self.checked_color)
+            elif label.testAttribute(Qt.WidgetAttribute.WA_SetPalette):
+                label.setPalette(QPalette())
+        elif label.property("checked") != checked:
+            label.setProperty("checked", checked)
+            repolish(label)
+
+    def set_link_icon(self, icon):
+        self.icon_label.setPixmap(icon.pixmap(16, 16))
+        self.icon_label.show()
+
+    def set_link_status(self, ok):
+        self.link_badge.setVisible(ok is False)
+
+    def open_task(self):
+        if self.link:
+            self.link_activated.emit(self.link)
 
 class WelcomeScreen(QWidget):
     def __init__(self, parent=None):
@@ -267,28 +2773,18 @@ class WelcomeScreen(QWidget):
         layout.addSpacerItem(QSpacerItem(20, 60, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
         
         logo_label = QLabel()
-        logo_pixmap = load_pixmap("todo1.png")
+        logo_pixmap = load_scaled_pixmap("todo1.png", 80)
         if not logo_pixmap.isNull():
-            logo_pixmap = logo_pixmap.scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
             logo_label.setPixmap(logo_pixmap)
         else:
             logo_label.setText("📝")
-            logo_label.setStyleSheet("font-size: 48px; color: #2E86AB;")
+            logo_label.setObjectName("logo")
         
         logo_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        logo_label.setStyleSheet("background-color: transparent;")
         layout.addWidget(logo_label)
 
         title_label = QLabel("✔️ Simply TodoTask")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 32px;
-                font-weight: bold;
-                color: #2E86AB;
-                background-color: transparent;
-                padding: 10px;
-            }
-        """)
+        title_label.setObjectName("welcomeTitle")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title_label)
 
@@ -297,15 +2793,7 @@ class WelcomeScreen(QWidget):
             "To get started, load an existing list\n"
             "or create a new one by clicking on Customize"
         )
-        welcome_text.setStyleSheet("""
-            QLabel {
-                font-size: 14px;
-                color: #555555;
-                background-color: transparent;
-                text-align: center;
-                line-height: 1.4;
-            }
-        """)
+        welcome_text.setObjectName("welcomeText")
         welcome_text.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(welcome_text)
 
@@ -313,8 +2801,8 @@ class WelcomeScreen(QWidget):
         button_layout.setSpacing(15)
         button_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        load_btn = ModernButton("📂 Load TodoTask List", "#2196F3", height=50)
-        personalize_btn = ModernButton("🎯 Create / Customize Todo", "#4CAF50", height=50)
+        load_btn = ModernButton("📂 Load TodoTask List", "primary", height=50)
+        personalize_btn = ModernButton("🎯 Create / Customize Todo", "success", height=50)
 
         button_layout.addWidget(load_btn)
         button_layout.addWidget(personalize_btn)
@@ -326,21 +2814,21 @@ class WelcomeScreen(QWidget):
         info_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         version_label = QLabel("Simply TodoTask v0.1")
-        version_label.setStyleSheet("font-size: 11px; font-weight: bold; color: #333333;")
+        version_label.setObjectName("versionLabel")
         version_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         author_label = QLabel("Created with ♥ by Daniele Borghi")
-        author_label.setStyleSheet("font-size: 11px; color: #2E86AB;")
+        author_label.setObjectName("authorLabel")
         author_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         github_label = QLabel("Visit my GITHUB repository for more information!")
-        github_label.setStyleSheet("font-size: 11px; color: #666666;")
+        github_label.setObjectName("githubLabel")
         github_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         github_label.setCursor(Qt.CursorShape.PointingHandCursor)
         github_label.mousePressEvent = lambda e: webbrowser.open("https://github.com/danjiss/Simply-TodoTask-Checklist")
 
         date_label = QLabel(f"Update: Nov. 2025")
-        date_label.setStyleSheet("font-size: 10px; color: #888888;")
+        date_label.setObjectName("dateLabel")
         date_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         info_layout.addWidget(version_label)
@@ -359,12 +2847,6 @@ class SaveDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Save List")
         self.setFixedSize(400, 180)
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #f8f9fa;
-                border-radius: 12px;
-            }
-        """)
         self.setWindowIcon(load_icon("todo.ico"))
         self.setup_ui()
 
@@ -374,21 +2856,14 @@ class SaveDialog(QDialog):
         layout.setContentsMargins(25, 25, 25, 25)
 
         message = QLabel("How do you want to save the list?")
-        message.setStyleSheet("""
-            QLabel {
-                font-size: 14px;
-                font-weight: bold;
-                color: #333333;
-                text-align: center;
-            }
-        """)
+        message.setObjectName("dialogMessage")
         layout.addWidget(message)
 
         button_layout = QHBoxLayout()
         
-        save_btn = ModernButton("💾 Save", "#2196F3", height=45)
-        save_as_btn = ModernButton("📁 Save as new", "#4CAF50", height=45)
-        cancel_btn = ModernButton("❌ Cancel", "#757575", height=45)
+        save_btn = ModernButton("💾 Save", "primary", height=45)
+        save_as_btn = ModernButton("📁 Save as new", "success", height=45)
+        cancel_btn = ModernButton("❌ Cancel", "neutral", height=45)
 
         save_btn.clicked.connect(lambda: self.done(1))
         save_as_btn.clicked.connect(lambda: self.done(2))
@@ -405,12 +2880,6 @@ class ResetDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Reset Task")
         self.setFixedSize(400, 180)
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #f8f9fa;
-                border-radius: 12px;
-            }
-        """)
         self.setWindowIcon(load_icon("todo.ico"))
         self.setup_ui()
 
@@ -420,21 +2889,14 @@ class ResetDialog(QDialog):
         layout.setContentsMargins(15, 15, 15, 15)
 
         message = QLabel("What do you want to reset?")
-        message.setStyleSheet("""
-            QLabel {
-                font-size: 14px;
-                font-weight: bold;
-                color: #333333;
-                text-align: center;
-            }
-        """)
+        message.setObjectName("dialogMessage")
         layout.addWidget(message)
 
         button_layout = QHBoxLayout()
         
-        reset_checks_btn = ModernButton("🔄 Reset Checks", "#2196F3", height=45)
-        reset_tasks_btn = ModernButton("🗑 Reset To-Do", "#f44336", height=45)
-        cancel_btn = ModernButton("❌ Cancel", "#757575", height=45)
+        reset_checks_btn = ModernButton("🔄 Reset Checks", "primary", height=45)
+        reset_tasks_btn = ModernButton("🗑 Reset To-Do", "danger", height=45)
+        cancel_btn = ModernButton("❌ Cancel", "neutral", height=45)
 
         reset_checks_btn.clicked.connect(lambda: self.done(1))
         reset_tasks_btn.clicked.connect(lambda: self.done(2))
@@ -447,102 +2909,76 @@ class ResetDialog(QDialog):
         layout.addLayout(button_layout)
 
 class CustomizeDialog(QDialog):
-    def __init__(self, parent, tasks, current_file_path, settings):
+    def __init__(self, parent, document):
         super().__init__(parent)
         self.parent = parent
-        self.tasks = tasks.copy()
-        self.current_file_path = current_file_path
-        self.settings = settings.copy()
+        self.document = document
+        self.current_file_path = document.file_path
+        self.settings = document.settings
         self.task_widgets = []
         self.setup_ui()
         self.setWindowIcon(load_icon("todo.ico"))
 
+        self.document.undo_stack.hold()
+        self.document.document_reset.connect(self.on_document_reset)
+        self.document.structure_changed.connect(self.refresh_tasks_layout)
+        self.document.task_changed.connect(self.on_task_changed)
+        self.document.subtasks_changed.connect(self.on_subtasks_changed)
+        self.document.settings_changed.connect(self.on_settings_changed)
+        self.document.undo_state_changed.connect(self.update_undo_buttons)
+        self.update_undo_buttons()
+
+        QShortcut(QKeySequence.StandardKey.Undo, self, self.undo)
+        QShortcut(QKeySequence.StandardKey.Redo, self, self.redo)
+
+    @property
+    def tasks(self):
+        return self.document.tasks
+
+    def done(self, result):
+        if result != QDialog.DialogCode.Accepted:
+            self.document.undo_stack.revert_to_hold()
+        self.document.undo_stack.release()
+        self.document.document_reset.disconnect(self.on_document_reset)
+        self.document.structure_changed.disconnect(self.refresh_tasks_layout)
+        self.document.task_changed.disconnect(self.on_task_changed)
+        self.document.subtasks_changed.disconnect(self.on_subtasks_changed)
+        self.document.settings_changed.disconnect(self.on_settings_changed)
+        self.document.undo_state_changed.disconnect(self.update_undo_buttons)
+        super().done(result)
+
+    def undo(self):
+        self.commit_pending_edits()
+        self.document.undo()
+
+    def redo(self):
+        self.document.redo()
+
+    def update_undo_buttons(self):
+        self.undo_btn.setEnabled(self.document.undo_stack.can_undo())
+        self.redo_btn.setEnabled(self.document.undo_stack.can_redo())
+        self.undo_btn.setToolTip(self.document.undo_stack.undo_text())
+        self.redo_btn.setToolTip(self.document.undo_stack.redo_text())
+
     def setup_ui(self):
         self.setWindowTitle("Customize To-Do")
         self.setMinimumSize(950, 750)
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #f8f9fa;
-                font-family: "Segoe UI", Arial, sans-serif;
-            }
-            QScrollBar:vertical {
-                background-color: #f0f0f0;
-                width: 12px;
-                border-radius: 6px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #c0c0c0;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #a0a0a0;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                border: none;
-                background: none;
-                height: 0px;
-            }
-        """)
 
         layout = QVBoxLayout(self)
         layout.setSpacing(15)
         layout.setContentsMargins(20, 20, 20, 20)
 
         title_label = QLabel("🎯 Customize To-Do List")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 22px;
-                font-weight: bold;
-                color: #2E86AB;
-                padding: 10px 0px;
-                background-color: transparent;
-            }
-        """)
+        title_label.setObjectName("dialogTitle")
         layout.addWidget(title_label)
 
         if self.current_file_path:
             file_info = QLabel(f"📄 Current file: {self.current_file_path}")
-            file_info.setStyleSheet("""
-                QLabel {
-                    font-size: 11px;
-                    color: #666666;
-                    background-color: #e3f2fd;
-                    padding: 8px 12px;
-                    border-radius: 6px;
-                    border: 1px solid #bbdefb;
-                }
-            """)
+            file_info.setObjectName("fileInfo")
             file_info.setWordWrap(True)
             layout.addWidget(file_info)
 
         self.tab_widget = QTabWidget()
-        self.tab_widget.setStyleSheet("""
-            QTabWidget::pane {
-                border: 1px solid #c0c0c0;
-                border-radius: 8px;
-                background-color: white;
-                margin-top: 5px;
-            }
-            QTabBar::tab {
-                background-color: #e0e0e0;
-                padding: 10px 20px;
-                margin-right: 3px;
-                border-top-left-radius: 6px;
-                border-top-right-radius: 6px;
-                font-weight: bold;
-                color: #555555;
-            }
-            QTabBar::tab:selected {
-                background-color: white;
-                color: #2E86AB;
-                border-bottom: 2px solid #2E86AB;
-            }
-            QTabBar::tab:hover {
-                background-color: #d0d0d0;
-            }
-        """)
 
         self.setup_general_tab()
         self.setup_tasks_tab()
@@ -552,13 +2988,17 @@ class CustomizeDialog(QDialog):
 
         button_layout = QHBoxLayout()
 
-        load_btn = ModernButton("📂 Load List", "#FF9800", height=45)
-        reset_btn = ModernButton("🔄 Reset To-Do", "#f44336", height=45)
-        cancel_btn = ModernButton("❌ Cancel", "#757575", height=45)
-        save_btn = ModernButton("💾 Save Changes", "#2196F3", height=45)
+        load_btn = ModernButton("📂 Load List", "warning", height=45)
+        reset_btn = ModernButton("🔄 Reset To-Do", "danger", height=45)
+        self.undo_btn = ModernButton("↶ Undo", "muted", height=45)
+        self.redo_btn = ModernButton("↷ Redo", "muted", height=45)
+        cancel_btn = ModernButton("❌ Cancel", "neutral", height=45)
+        save_btn = ModernButton("💾 Save Changes", "primary", height=45)
 
         button_layout.addWidget(load_btn)
         button_layout.addWidget(reset_btn)
+        button_layout.addWidget(self.undo_btn)
+        button_layout.addWidget(self.redo_btn)
         button_layout.addStretch()
         button_layout.addWidget(cancel_btn)
         button_layout.addWidget(save_btn)
@@ -567,6 +3007,8 @@ class CustomizeDialog(QDialog):
 
         load_btn.clicked.connect(self.load_configuration)
         reset_btn.clicked.connect(self.show_reset_dialog)
+        self.undo_btn.clicked.connect(self.undo)
+        self.redo_btn.clicked.connect(self.redo)
         cancel_btn.clicked.connect(self.reject)
         save_btn.clicked.connect(self.show_save_dialog)
 
@@ -582,113 +3024,71 @@ class CustomizeDialog(QDialog):
         group_layout.setContentsMargins(20, 20, 20, 20)
 
         title_label = QLabel("⚙️ List Settings")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 16px;
-                font-weight: bold;
-                color: #2E86AB;
-                padding-bottom: 5px;
-                border-bottom: 2px solid #e0e0e0;
-            }
-        """)
+        title_label.setObjectName("sectionTitle")
         group_layout.addWidget(title_label)
 
         title_row = QHBoxLayout()
         title_label = QLabel("Title:")
-        title_label.setStyleSheet("font-size: 12px; font-weight: bold;")
+        title_label.setObjectName("fieldLabel")
         self.title_edit = QLineEdit(self.settings.get('title', 'Simply TodoTask'))
-        self.title_edit.setStyleSheet("""
-            QLineEdit {
-                padding: 8px 12px;
-                border: 1px solid #cccccc;
-                border-radius: 6px;
-                font-size: 12px;
-            }
-            QLineEdit:focus {
-                border-color: #2196F3;
-            }
-        """)
+        self.title_edit.editingFinished.connect(lambda: self.document.set_settings({"title": self.title_edit.text()}))
         title_row.addWidget(title_label)
         title_row.addWidget(self.title_edit, 1)
         group_layout.addLayout(title_row)
 
         font_row = QHBoxLayout()
         font_label = QLabel("Font size:")
-        font_label.setStyleSheet("font-size: 12px; font-weight: bold;")
+        font_label.setObjectName("fieldLabel")
         self.font_combo = QComboBox()
         self.font_combo.addItems(["small", "medium", "large"])
-        current_font = self.settings.get('font_size', 'medium')
-        current_font = 'small' if current_font == 'piccolo' else 'medium' if current_font == 'medio' else 'large'
-        self.font_combo.setCurrentText(current_font)
-        self.font_combo.setStyleSheet("""
-            QComboBox {
-                padding: 8px 12px;
-                border: 1px solid #cccccc;
-                border-radius: 6px;
-                font-size: 12px;
-                background-color: white;
-                min-width: 120px;
-            }
-            QComboBox:focus {
-                border-color: #2196F3;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 20px;
-            }
-            QComboBox::down-arrow {
-                width: 12px;
-                height: 12px;
-            }
-            QComboBox QAbstractItemView {
-                background-color: white;
-                border: 1px solid #cccccc;
-                border-radius: 6px;
-                outline: none;
-                padding: 4px;
-            }
-            QComboBox QAbstractItemView::item {
-                padding: 8px 12px;
-                border: none;
-                color: #333333;
-            }
-            QComboBox QAbstractItemView::item:selected {
-                background-color: #2196F3;
-                color: white;
-            }
-            QComboBox QAbstractItemView::item:hover {
-                background-color: #e3f2fd;
-                color: #333333;
-            }
-        """)
+        self.font_combo.setCurrentText(self.settings.get('font_size', 'medium'))
+        self.font_combo.currentTextChanged.connect(lambda text: self.document.set_settings({"font_size": text}))
         font_row.addWidget(font_label)
         font_row.addWidget(self.font_combo)
         font_row.addStretch()
         group_layout.addLayout(font_row)
 
+        theme_row = QHBoxLayout()
+        theme_label = QLabel("Theme:")
+        theme_label.setObjectName("fieldLabel")
+        self.theme_combo = QComboBox()
+        self.theme_combo.addItems(list(THEMES))
+        self.theme_combo.setCurrentText(self.settings.get('theme', 'light'))
+        self.theme_combo.currentTextChanged.connect(lambda text: self.document.set_settings({"theme": text}))
+        theme_row.addWidget(theme_label)
+        theme_row.addWidget(self.theme_combo)
+        theme_row.addStretch()
+        group_layout.addLayout(theme_row)
+
+        render_row = QHBoxLayout()
+        render_label = QLabel("Rendering:")
+        render_label.setObjectName("fieldLabel")
+        self.render_combo = QComboBox()
+        self.render_combo.addItems(list(RENDER_MODES))
+        self.render_combo.setCurrentText(self.settings.get('render_mode', 'standard'))
+        self.render_combo.currentTextChanged.connect(lambda text: self.document.set_settings({"render_mode": text}))
+        self.render_combo.setToolTip("lite: native look without styling, faster on remote desktops")
+        render_row.addWidget(render_label)
+        render_row.addWidget(self.render_combo)
+        render_row.addStretch()
+        group_layout.addLayout(render_row)
+
         self.strikethrough_check = QCheckBox("Show strikethrough for completed tasks")
         self.strikethrough_check.setChecked(self.settings.get('strikethrough', True))
-        self.strikethrough_check.setStyleSheet("""
-            QCheckBox {
-                font-size: 12px;
-                font-weight: bold;
-                spacing: 8px;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-                border: 2px solid #cccccc;
-                border-radius: 3px;
-                background-color: white;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #4CAF50;
-                border: 2px solid #4CAF50;
-                image: url("data:image/svg+xml;utf8,<svg xmlns='http://www.w3.org/2000/svg' width='12' height='12' viewBox='0 0 12 12'><path fill='white' d='M10.28 2.28L4.5 8.06 1.72 5.28a1 1 0 00-1.41 1.41l3.35 3.36a1 1 0 001.41 0l6.36-6.36a1 1 0 10-1.41-1.41z'/></svg>");
-            }
-        """)
+        self.strikethrough_check.toggled.connect(lambda checked: self.document.set_settings({"strikethrough": checked}))
+        self.strikethrough_check.setObjectName("settingCheck")
         group_layout.addWidget(self.strikethrough_check)
 
+        schedule_row = QHBoxLayout()
+        schedule_label = QLabel("Automatic reset:")
+        schedule_label.setObjectName("fieldLabel")
+        self.schedule_edit = QLineEdit(self.settings.get('reset_schedule', ''))
+        self.schedule_edit.setPlaceholderText("e.g. daily 06:00; weekly mon 06:00; every 8h 06:00")
+        self.schedule_edit.editingFinished.connect(self.commit_schedule_edit)
+        schedule_row.addWidget(schedule_label)
+        schedule_row.addWidget(self.schedule_edit, 1)
+        group_layout.addLayout(schedule_row)
+
         layout.addWidget(group)
         layout.addStretch()
 
@@ -704,12 +3104,6 @@ class CustomizeDialog(QDialog):
         scroll.setWidgetResizable(True)
         scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-        """)
         
         self.scroll_widget = QWidget()
         self.tasks_layout = QVBoxLayout(self.scroll_widget)
@@ -721,7 +3115,7 @@ class CustomizeDialog(QDialog):
         scroll.setWidget(self.scroll_widget)
         layout.addWidget(scroll, 1)
 
-        add_btn = ModernButton("➕ Add New To-Do", "#4CAF50", height=45)
+        add_btn = ModernButton("➕ Add New To-Do", "success", height=45)
         add_btn.clicked.connect(self.add_new_task)
         layout.addWidget(add_btn)
 
@@ -730,8 +3124,10 @@ class CustomizeDialog(QDialog):
     def refresh_tasks_layout(self):
         for i in reversed(range(self.tasks_layout.count())):
             item = self.tasks_layout.itemAt(i)
-            if item and item.widget():
-                item.widget().setParent(None)
+            widget = item.widget() if item else None
+            if widget:
+                widget.setParent(None)
+                widget.deleteLater()
         
         self.task_widgets = []
         
@@ -740,17 +3136,7 @@ class CustomizeDialog(QDialog):
 
         if not self.tasks:
             no_tasks_label = QLabel("No To-Do present. Click 'Add New To-Do' to get started!")
-            no_tasks_label.setStyleSheet("""
-                QLabel {
-                    font-size: 14px; 
-                    color: #666666; 
-                    text-align: center;
-                    padding: 40px;
-                    background-color: white;
-                    border-radius: 8px;
-                    border: 2px dashed #cccccc;
-                }
-            """)
+            no_tasks_label.setObjectName("emptyLabel")
             no_tasks_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.tasks_layout.addWidget(no_tasks_label)
 
@@ -766,33 +3152,16 @@ class CustomizeDialog(QDialog):
         group_layout.setContentsMargins(20, 20, 20, 20)
 
         title_label = QLabel("💾 File Management")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 16px;
-                font-weight: bold;
-                color: #2E86AB;
-                padding-bottom: 5px;
-                border-bottom: 2px solid #e0e0e0;
-            }
-        """)
+        title_label.setObjectName("sectionTitle")
         group_layout.addWidget(title_label)
 
         file_layout = QVBoxLayout()
         file_label = QLabel("Current file:")
-        file_label.setStyleSheet("font-size: 12px; font-weight: bold; color: #333333;")
+        file_label.setObjectName("fieldLabel")
         
         file_text = self.current_file_path if self.current_file_path else "No file loaded"
         self.file_label = QLabel(file_text)
-        self.file_label.setStyleSheet("""
-            QLabel {
-                font-size: 11px;
-                color: #666666;
-                background-color: #f5f5f5;
-                padding: 10px 12px;
-                border-radius: 6px;
-                border: 1px solid #e0e0e0;
-            }
-        """)
+        self.file_label.setObjectName("fileBox")
         self.file_label.setWordWrap(True)
         
         file_layout.addWidget(file_label)
@@ -800,7 +3169,7 @@ class CustomizeDialog(QDialog):
         group_layout.addLayout(file_layout)
 
         if self.current_file_path:
-            unload_btn = ModernButton("🗑️ Remove Current File", "#ff6b6b", height=45)
+            unload_btn = ModernButton("🗑️ Remove Current File", "danger", height=45)
             unload_btn.clicked.connect(self.unload_file)
             group_layout.addWidget(unload_btn)
 
@@ -818,98 +3187,73 @@ class CustomizeDialog(QDialog):
         header_layout = QHBoxLayout()
         
         task_number = QLabel(f"📝 To-Do #{index + 1}")
-        task_number.setStyleSheet("""
-            QLabel {
-                font-size: 14px;
-                font-weight: bold;
-                color: #2E86AB;
-            }
-        """)
+        task_number.setObjectName("taskNumber")
         
         header_layout.addWidget(task_number)
         header_layout.addStretch()
-        
+
+        for arrow, offset in (("▲", -1), ("▼", 1)):
+            move_btn = QPushButton(arrow)
+            move_btn.setFixedSize(30, 30)
+            move_btn.setObjectName("moveButton")
+            move_btn.setEnabled(0 <= index + offset < len(self.tasks))
+            move_btn.clicked.connect(lambda checked, offset=offset: self.move_task(index, index + offset))
+            header_layout.addWidget(move_btn)
+
         delete_btn = QPushButton("🗑 Delete")
         delete_btn.setFixedSize(80, 30)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                font-size: 10px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-        """)
+        delete_btn.setObjectName("deleteButton")
         delete_btn.clicked.connect(lambda: self.delete_task(index))
         header_layout.addWidget(delete_btn)
 
         task_layout.addLayout(header_layout)
 
         details_card = ModernCard()
-        details_card.setStyleSheet("ModernCard { background-color: #f8f9fa; }")
         details_layout = QVBoxLayout(details_card)
         details_layout.setContentsMargins(15, 15, 15, 15)
         details_layout.setSpacing(10)
 
         title_row = QHBoxLayout()
         title_label = QLabel("Title:")
-        title_label.setStyleSheet("font-size: 11px; font-weight: bold; color: #555555;")
+        title_label.setObjectName("detailLabel")
         name_edit = QLineEdit(task_data['name'])
-        name_edit.setStyleSheet("""
-            QLineEdit {
-                padding: 8px 12px;
-                border: 1px solid #cccccc;
-                border-radius: 6px;
-                font-size: 12px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border-color: #2196F3;
-            }
-        """)
+        name_edit.editingFinished.connect(lambda: self.commit_name_edit(index))
         title_row.addWidget(title_label)
         title_row.addWidget(name_edit, 1)
         details_layout.addLayout(title_row)
 
         link_row = QHBoxLayout()
         link_label = QLabel("Link (optional):")
-        link_label.setStyleSheet("font-size: 11px; font-weight: bold; color: #555555;")
+        link_label.setObjectName("detailLabel")
         
         link_edit = QLineEdit(task_data.get('link', ''))
-        link_edit.setStyleSheet("""
-            QLineEdit {
-                padding: 8px 12px;
-                border: 1px solid #cccccc;
-                border-radius: 6px;
-                font-size: 12px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border-color: #2196F3;
-            }
-        """)
-        browse_btn = ModernButton("Browse", "#E0E0E0", height=35)
-        browse_btn.setStyleSheet(browse_btn.styleSheet() + "color: #333333;")
-        browse_btn.clicked.connect(lambda: self.browse_file(link_edit))
+        browse_btn = ModernButton("Browse", "light", height=35)
+        browse_btn.clicked.connect(lambda: self.browse_file(index))
+        link_edit.editingFinished.connect(lambda: self.commit_link_edit(index))
         
         link_row.addWidget(link_label)
         link_row.addWidget(link_edit, 1)
         link_row.addWidget(browse_btn)
         details_layout.addLayout(link_row)
 
+        due_row = QHBoxLayout()
+        due_label = QLabel("Due (optional):")
+        due_label.setObjectName("detailLabel")
+        due_edit = self.create_due_edit(task_data.get('due', ''))
+        due_edit.editingFinished.connect(lambda: self.commit_task_due(index))
+        due_row.addWidget(due_label)
+        due_row.addWidget(due_edit)
+        due_row.addStretch()
+        details_layout.addLayout(due_row)
+
         task_layout.addWidget(details_card)
 
         subtasks_card = ModernCard()
-        subtasks_card.setStyleSheet("ModernCard { background-color: #f8f9fa; }")
         subtasks_layout = QVBoxLayout(subtasks_card)
         subtasks_layout.setContentsMargins(15, 15, 15, 15)
 
         subtasks_title = QLabel("📋 Tasks:")
-        subtasks_title.setStyleSheet("font-size: 12px; font-weight: bold; color: #555555; margin-bottom: 8px;")
+        subtasks_title.setObjectName("detailTitle")
         subtasks_layout.addWidget(subtasks_title)
 
         subtasks_container = QWidget()
@@ -918,25 +3262,23 @@ class CustomizeDialog(QDialog):
         subtasks_container_layout.setContentsMargins(0, 0, 0, 0)
 
         task_entries = []
-        for subtask in task_data['sub_tasks']:
-            self.add_subtask_entry(subtasks_container_layout, task_entries, subtask)
+        for subtask, due in zip(task_data['sub_tasks'], task_data['sub_task_dues']):
+            self.add_subtask_entry(index, subtasks_container_layout, task_entries, subtask, due)
 
         subtasks_layout.addWidget(subtasks_container)
 
-        add_subtask_btn = ModernButton("➕ Add Task", "#E0E0E0", height=35)
-        add_subtask_btn.setStyleSheet(add_subtask_btn.styleSheet() + "color: #333333;")
-        add_subtask_btn.clicked.connect(lambda: self.add_subtask_entry(subtasks_container_layout, task_entries))
+        add_subtask_btn = ModernButton("➕ Add Task", "light", height=35)
+        add_subtask_btn.clicked.connect(lambda: self.document.add_subtask(index, ""))
         subtasks_layout.addWidget(add_subtask_btn)
 
         task_layout.addWidget(subtasks_card)
 
         colors_card = ModernCard()
-        colors_card.setStyleSheet("ModernCard { background-color: #f8f9fa; }")
         colors_layout = QVBoxLayout(colors_card)
         colors_layout.setContentsMargins(15, 15, 15, 15)
         
         colors_title = QLabel("🎨 Color Customization")
-        colors_title.setStyleSheet("font-size: 12px; font-weight: bold; color: #555555; margin-bottom: 8px;")
+        colors_title.setObjectName("detailTitle")
         colors_layout.addWidget(colors_title)
 
         colors_row = QHBoxLayout()
@@ -944,21 +3286,12 @@ class CustomizeDialog(QDialog):
 
         base_color_layout = QHBoxLayout()
         base_color_label = QLabel("Title color:")
-        base_color_label.setStyleSheet("font-size: 11px; font-weight: bold; color: #666666;")
+        base_color_label.setObjectName("detailLabel")
         base_color_btn = QPushButton()
         base_color_btn.setFixedSize(30, 30)
         base_color = task_data.get('base_color', 'default')
-        base_color_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {'#1a1a1a' if base_color == 'default' else base_color};
-                border: 2px solid #cccccc;
-                border-radius: 6px;
-            }}
-            QPushButton:hover {{
-                border-color: #2196F3;
-            }}
-        """)
-        base_color_btn.clicked.connect(lambda: self.choose_color(index, 'base', base_color_btn))
+        self.set_color_button(base_color_btn, base_color, "base")
+        base_color_btn.clicked.connect(lambda: self.choose_color(index, 'base'))
         base_color_layout.addWidget(base_color_label)
         base_color_layout.addWidget(base_color_btn)
         base_color_layout.addStretch()
@@ -966,21 +3299,12 @@ class CustomizeDialog(QDialog):
 
         selected_color_layout = QHBoxLayout()
         selected_color_label = QLabel("Completed color:")
-        selected_color_label.setStyleSheet("font-size: 11px; font-weight: bold; color: #666666;")
+        selected_color_label.setObjectName("detailLabel")
         selected_color_btn = QPushButton()
         selected_color_btn.setFixedSize(30, 30)
         selected_color = task_data.get('selected_color', 'default')
-        selected_color_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {'#4CAF50' if selected_color == 'default' else selected_color};
-                border: 2px solid #cccccc;
-                border-radius: 6px;
-            }}
-            QPushButton:hover {{
-                border-color: #2196F3;
-            }}
-        """)
-        selected_color_btn.clicked.connect(lambda: self.choose_color(index, 'selected', selected_color_btn))
+        self.set_color_button(selected_color_btn, selected_color, "selected")
+        selected_color_btn.clicked.connect(lambda: self.choose_color(index, 'selected'))
         selected_color_layout.addWidget(selected_color_label)
         selected_color_layout.addWidget(selected_color_btn)
         selected_color_layout.addStretch()
@@ -994,6 +3318,7 @@ class CustomizeDialog(QDialog):
             'widget': task_card,
             'name_edit': name_edit,
             'link_edit': link_edit,
+            'due_edit': due_edit,
             'base_color_btn': base_color_btn,
             'selected_color_btn': selected_color_btn,
             'task_entries': task_entries,
@@ -1004,64 +3329,191 @@ class CustomizeDialog(QDialog):
 
         self.tasks_layout.addWidget(task_card)
 
-    def add_subtask_entry(self, layout, task_entries, text=""):
+    def create_due_edit(self, due):
+        due_edit = QLineEdit(due)
+        due_edit.setObjectName("dueEdit")
+        due_edit.setPlaceholderText("YYYY-MM-DD HH:MM")
+        due_edit.setFixedWidth(140)
+        self.set_edit_valid(due_edit, True)
+        return due_edit
+
+    def set_edit_valid(self, edit, valid):
+        if edit.property("invalid") != (not valid):
+            edit.setProperty("invalid", not valid)
+            repolish(edit)
+
+    def commit_due_edit(self, due_edit, task_index, sub_index):
+        text = due_edit.text().strip()
+        when = parse_due(text)
+        valid = not text or when is not None
+        self.set_edit_valid(due_edit, valid)
+        if not valid:
+            return
+        due = format_due(when) if when else ""
+        if sub_index < 0:
+            self.document.set_task_field(task_index, 'due', due)
+        else:
+            self.document.set_subtask_due(task_index, sub_index, due)
+
+    def add_subtask_entry(self, task_index, layout, task_entries, text="", due=""):
         entry_widget = QWidget()
         entry_layout = QHBoxLayout(entry_widget)
         entry_layout.setContentsMargins(0, 0, 0, 0)
         entry_layout.setSpacing(8)
         
         entry = QLineEdit(text)
-        entry.setStyleSheet("""
-            QLineEdit {
-                padding: 8px 12px;
-                border: 1px solid #cccccc;
-                border-radius: 6px;
-                font-size: 11px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border-color: #2196F3;
-            }
-        """)
+        entry.setObjectName("subtaskEdit")
         
         delete_btn = QPushButton("❌")
         delete_btn.setFixedSize(25, 25)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-size: 9px;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-        """)
+        delete_btn.setObjectName("deleteSubtaskButton")
         
+        due_edit = self.create_due_edit(due)
+
         entry_layout.addWidget(entry, 1)
+        entry_layout.addWidget(due_edit)
         entry_layout.addWidget(delete_btn)
         
         layout.addWidget(entry_widget)
         
-        task_entries.append((entry_widget, entry))
-        delete_btn.clicked.connect(lambda: self.delete_subtask_entry(entry_widget, entry, task_entries))
+        task_entries.append((entry_widget, entry, due_edit))
+        entry.editingFinished.connect(self.commit_subtask_entry)
+        due_edit.editingFinished.connect(self.commit_subtask_due)
+        delete_btn.clicked.connect(self.delete_subtask_entry)
+
+    def sender_subtask(self):
+        # Row slots are shared; the sending widget's row container identifies the subtask
+        container = self.sender().parentWidget()
+        for task_index, widgets in enumerate(self.task_widgets):
+            for sub_index, row in enumerate(widgets['task_entries']):
+                if row[0] is container:
+                    return task_index, sub_index, row
+        return None
+
+    def commit_name_edit(self, index):
+        self.document.set_task_field(index, 'name', self.task_widgets[index]['name_edit'].text())
+
+    def commit_link_edit(self, index):
+        self.document.set_task_field(index, 'link', self.task_widgets[index]['link_edit'].text().strip())
+
+    def commit_task_due(self, index):
+        self.commit_due_edit(self.task_widgets[index]['due_edit'], index, -1)
+
+    def commit_subtask_entry(self):
+        found = self.sender_subtask()
+        if found is not None:
+            task_index, sub_index, (container, entry, due_edit) = found
+            self.document.set_subtask_text(task_index, sub_index, entry.text().strip())
+
+    def commit_subtask_due(self):
+        found = self.sender_subtask()
+        if found is not None:
+            task_index, sub_index, (container, entry, due_edit) = found
+            self.commit_due_edit(due_edit, task_index, sub_index)
+
+    def delete_subtask_entry(self):
+        found = self.sender_subtask()
+        if found is not None:
+            task_index, sub_index, _ = found
+            self.document.remove_subtask(task_index, sub_index)
+
+    def commit_pending_edits(self):
+        for index, widgets in enumerate(self.task_widgets):
+            self.document.set_task_field(index, 'name', widgets['name_edit'].text())
+            self.document.set_task_field(index, 'link', widgets['link_edit'].text().strip())
+            self.commit_due_edit(widgets['due_edit'], index, -1)
+            for sub_index, (container, entry, due_edit) in enumerate(widgets['task_entries']):
+                self.document.set_subtask_text(index, sub_index, entry.text().strip())
+                self.commit_due_edit(due_edit, index, sub_index)
+
+    def on_document_reset(self):
+        self.current_file_path = self.document.file_path
+        self.file_label.setText(self.current_file_path or "No file loaded")
+        self.on_settings_changed()
+        self.refresh_tasks_layout()
 
-    def delete_subtask_entry(self, container, entry, task_entries):
-        container.setParent(None)
-        if (container, entry) in task_entries:
-            task_entries.remove((container, entry))
+    def schedule_text(self):
+        return "; ".join(part.strip() for part in self.schedule_edit.text().split(';') if part.strip())
+
+    def commit_schedule_edit(self):
+        reset_schedule = self.schedule_text()
+        try:
+            parse_reset_schedule(reset_schedule)
+        except ValueError as e:
+            self.set_edit_valid(self.schedule_edit, False)
+            self.schedule_edit.setToolTip(str(e))
+            return
+        self.set_edit_valid(self.schedule_edit, True)
+        self.schedule_edit.setToolTip("")
+        self.document.set_settings({"reset_schedule": reset_schedule})
+
+    def on_settings_changed(self):
+        previous_schedule = self.settings.get("reset_schedule", "")
+        self.settings = self.document.settings
+        self.title_edit.setText(self.settings["title"])
+        self.font_combo.setCurrentText(self.settings["font_size"])
+        self.strikethrough_check.setChecked(self.settings["strikethrough"])
+        self.theme_combo.setCurrentText(self.settings.get("theme", "light"))
+        self.render_combo.setCurrentText(self.settings.get("render_mode", "standard"))
+        # Other settings must not wipe a schedule that is still being typed
+        if self.settings.get("reset_schedule", "") != previous_schedule:
+            self.schedule_edit.setText(self.settings.get("reset_schedule", ""))
+            self.set_edit_valid(self.schedule_edit, True)
+
+    def on_task_changed(self, index):
+        if index >= len(self.task_widgets):
+            return
+        task = self.tasks[index]
+        widgets = self.task_widgets[index]
+        if widgets['name_edit'].text() != task['name']:
+            widgets['name_edit'].setText(task['name'])
+        if widgets['link_edit'].text().strip() != task.get('link', ''):
+            widgets['link_edit'].setText(task.get('link', ''))
+        if parse_due(widgets['due_edit'].text()) != parse_due(task.get('due', '')):
+            widgets['due_edit'].setText(task.get('due', ''))
+            self.set_edit_valid(widgets['due_edit'], True)
+        for (container, entry, due_edit), text, due in zip(widgets['task_entries'], task['sub_tasks'],
+                                                           task['sub_task_dues']):
+            if entry.text().strip() != text:
+                entry.setText(text)
+            if parse_due(due_edit.text()) != parse_due(due):
+                due_edit.setText(due)
+                self.set_edit_valid(due_edit, True)
+        self.set_color_button(widgets['base_color_btn'], task.get('base_color', 'default'), "base")
+        self.set_color_button(widgets['selected_color_btn'], task.get('selected_color', 'default'), "selected")
+
+    def on_subtasks_changed(self, index):
+        if index >= len(self.task_widgets):
+            return
+        widgets = self.task_widgets[index]
+        layout = widgets['subtasks_container_layout']
+        task_entries = widgets['task_entries']
+        for container, entry, due_edit in task_entries:
+            container.setParent(None)
+            container.deleteLater()
+        task_entries.clear()
+        task = self.tasks[index]
+        for subtask, due in zip(task['sub_tasks'], task['sub_task_dues']):
+            self.add_subtask_entry(index, layout, task_entries, subtask, due)
+
+    def set_color_button(self, button, color, kind):
+        button.setObjectName("colorSwatch")
+        button.setProperty("kind", kind)
+        if is_lite(self.document.settings):
+            palette = QPalette()
+            if color != 'default':
+                palette.setColor(QPalette.ColorRole.Button, QColor(color))
+            button.setPalette(palette)
+        else:
+            button.setStyleSheet("" if color == 'default' else f"QPushButton#colorSwatch {{ background-color: {color}; }}")
 
     def add_new_task(self):
-        new_task = {
-            "name": "New To-Do",
-            "sub_tasks": ["New task"],
-            "base_color": "default",
-            "selected_color": "default",
-            "link": ""
-        }
-        self.tasks.append(new_task)
-        self.refresh_tasks_layout()
+        self.commit_pending_edits()
+        self.document.add_task()
+
+    def move_task(self, from_index, to_index):
+        self.commit_pending_edits()
+        self.document.move_task(from_index, to_index)
 
     def delete_task(self, index):
         reply = QMessageBox.question(
@@ -1071,10 +3523,10 @@ class CustomizeDialog(QDialog):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.tasks.pop(index)
-            self.refresh_tasks_layout()
+            self.commit_pending_edits()
+            self.document.remove_task(index)
 
-    def choose_color(self, index, color_type, button):
+    def choose_color(self, index, color_type):
         current_color = self.tasks[index].get(f"{color_type}_color", "default")
         if current_color != "default":
             initial = QColor(current_color)
@@ -1083,22 +3535,13 @@ class CustomizeDialog(QDialog):
             
         color = QColorDialog.getColor(initial, self, f"Choose {color_type} color")
         if color.isValid():
-            button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {color.name()};
-                    border: 2px solid #cccccc;
-                    border-radius: 6px;
-                }}
-                QPushButton:hover {{
-                    border-color: #2196F3;
-                }}
-            """)
-            self.tasks[index][f"{color_type}_color"] = color.name()
-
-    def browse_file(self, link_edit):
+            self.document.set_task_field(index, f"{color_type}_color", color.name())
+
+    def browse_file(self, index):
         file_path, _ = QFileDialog.getOpenFileName(self, "Select file")
         if file_path:
-            link_edit.setText(file_path)
+            self.task_widgets[index]['link_edit'].setText(file_path)
+            self.document.set_task_field(index, 'link', file_path)
 
     def unload_file(self):
         reply = QMessageBox.question(
@@ -1107,23 +3550,13 @@ class CustomizeDialog(QDialog):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if reply == QMessageBox.StandardButton.Yes:
-            self.current_file_path = None
-            self.tasks = []
-            self.task_widgets = []
-            
-            self.parent.current_file_path = None
-            self.parent.tasks = []
-            self.parent.settings = {
-                "title": "Simply TodoTask",
-                "font_size": "medium",
-                "strikethrough": True
-            }
-            self.parent.show_welcome_screen()
+            self.document.unload()
             self.accept()
 
     def show_reset_dialog(self):
         dialog = ResetDialog(self)
         result = dialog.exec()
+        dialog.deleteLater()
         
         if result == 1:
             self.reset_checks()
@@ -1131,11 +3564,10 @@ class CustomizeDialog(QDialog):
             self.reset_tasks()
 
     def reset_checks(self):
-        QMessageBox.information(self, "Reset Checks", "Checks will be reset when you save the changes.")
+        self.document.reset_checks()
 
     def reset_tasks(self):
-        self.tasks = []
-        self.refresh_tasks_layout()
+        self.document.clear_tasks()
 
     def load_configuration(self):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -1143,71 +3575,7 @@ class CustomizeDialog(QDialog):
         )
         if file_path:
             try:
-                tasks = []
-                settings = {
-                    "title": "Simply TodoTask",
-                    "font_size": "medium",
-                    "strikethrough": True
-                }
-                
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    
-                    current_task = None
-                    i = 0
-                    while i < len(lines):
-                        line = lines[i].strip()
-                        if line.startswith("[SETTINGS]"):
-                            i += 1
-                            while i < len(lines) and not lines[i].startswith("[TASK]") and lines[i].strip() != "":
-                                line = lines[i].strip()
-                                if line.startswith("title="):
-                                    settings["title"] = line.split('=', 1)[1]
-                                elif line.startswith("font_size="):
-                                    font_size = line.split('=', 1)[1]
-                                    if font_size in ['piccolo', 'medio', 'grande']:
-                                        font_size = 'small' if font_size == 'piccolo' else 'medium' if font_size == 'medio' else 'large'
-                                    settings["font_size"] = font_size
-                                elif line.startswith("strikethrough="):
-                                    settings["strikethrough"] = line.split('=', 1)[1].lower() == "true"
-                                i += 1
-                            continue
-                        elif line.startswith("[TASK]"):
-                            if current_task:
-                                tasks.append(current_task)
-                            current_task = {
-                                "name": "",
-                                "sub_tasks": [],
-                                "base_color": "default",
-                                "selected_color": "default",
-                                "link": ""
-                            }
-                        elif line.startswith("name=") and current_task is not None:
-                            current_task["name"] = line[5:]
-                        elif line.startswith("base_color=") and current_task is not None:
-                            current_task["base_color"] = line[11:]
-                        elif line.startswith("selected_color=") and current_task is not None:
-                            current_task["selected_color"] = line[15:]
-                        elif line.startswith("link=") and current_task is not None:
-                            current_task["link"] = line[5:]
-                        elif line.startswith("sub_task=") and current_task is not None:
-                            current_task["sub_tasks"].append(line[9:])
-                        i += 1
-                    
-                    if current_task:
-                        tasks.append(current_task)
-                
-                self.tasks = tasks
-                self.current_file_path = file_path
-                self.settings = settings
-                
-                self.file_label.setText(file_path)
-                self.title_edit.setText(settings["title"])
-                self.font_combo.setCurrentText(settings["font_size"])
-                self.strikethrough_check.setChecked(settings["strikethrough"])
-                
-                self.refresh_tasks_layout()
-                
+                self.document.load(file_path)
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Cannot load the list: {e}")
 
@@ -1218,6 +3586,7 @@ class CustomizeDialog(QDialog):
             
         dialog = SaveDialog(self)
         result = dialog.exec()
+        dialog.deleteLater()
         
         if result == 1:
             self._save_to_file(self.current_file_path)
@@ -1232,66 +3601,43 @@ class CustomizeDialog(QDialog):
             self._save_to_file(file_path)
 
     def _save_to_file(self, file_path):
+        reset_schedule = self.schedule_text()
+        try:
+            parse_reset_schedule(reset_schedule)
+        except ValueError as e:
+            QMessageBox.warning(self, "Automatic reset", str(e))
+            return
+
         try:
-            tasks_to_save = []
+            self.commit_pending_edits()
             for i in range(len(self.tasks)):
-                widgets = self.task_widgets[i]
-                
-                name = widgets['name_edit'].text().strip() or f"To-Do {i+1}"
-                link = widgets['link_edit'].text().strip()
-                
-                base_color = self.tasks[i].get('base_color', 'default')
-                selected_color = self.tasks[i].get('selected_color', 'default')
-                
-                sub_tasks = []
-                for container, entry in widgets['task_entries']:
-                    task_text = entry.text().strip()
-                    if task_text:
-                        sub_tasks.append(task_text)
-                
+                if not self.tasks[i]['name'].strip():
+                    self.document.set_task_field(i, 'name', f"To-Do {i+1}")
+                else:
+                    self.document.set_task_field(i, 'name', self.tasks[i]['name'].strip())
+
+                sub_tasks = self.tasks[i]['sub_tasks']
+                for sub_index in reversed(range(len(sub_tasks))):
+                    if not sub_tasks[sub_index].strip():
+                        self.document.remove_subtask(i, sub_index)
+
                 if not sub_tasks:
-                    sub_tasks = ["New task"]
-                
-                task_to_save = {
-                    "name": name,
-                    "sub_tasks": sub_tasks,
-                    "base_color": base_color,
-                    "selected_color": selected_color,
-                    "link": link
-                }
-                tasks_to_save.append(task_to_save)
-            
-            settings_to_save = {
+                    self.document.add_subtask(i)
+
+            self.document.set_settings({
                 "title": self.title_edit.text(),
                 "font_size": self.font_combo.currentText(),
-                "strikethrough": self.strikethrough_check.isChecked()
-            }
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write("[SETTINGS]\n")
-                f.write(f"title={settings_to_save['title']}\n")
-                f.write(f"font_size={settings_to_save['font_size']}\n")
-                f.write(f"strikethrough={settings_to_save['strikethrough']}\n")
-                f.write("\n")
-                
-                for task in tasks_to_save:
-                    f.write("[TASK]\n")
-                    f.write(f"name={task['name']}\n")
-                    f.write(f"base_color={task.get('base_color', 'default')}\n")
-                    f.write(f"selected_color={task.get('selected_color', 'default')}\n")
-                    f.write(f"link={task.get('link', '')}\n")
-                    for sub_task in task['sub_tasks']:
-                        f.write(f"sub_task={sub_task}\n")
-                    f.write("\n")
-            
+                "strikethrough": self.strikethrough_check.isChecked(),
+                "theme": self.theme_combo.currentText(),
+                "render_mode": self.render_combo.currentText(),
+                "reset_schedule": reset_schedule
+            })
+
+            self.document.save(file_path)
+
             self.current_file_path = file_path
             self.file_label.setText(file_path)
             
-            self.parent.tasks = tasks_to_save
-            self.parent.settings = settings_to_save
-            self.parent.current_file_path = file_path
-            self.parent.refresh_tasks()
-            
             self.accept()
             
         except Exception as e:
@@ -1302,12 +3648,6 @@ class InfoDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Information")
         self.setFixedSize(500, 450)
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #ffffff;
-                border-radius: 12px;
-            }
-        """)
         self.setWindowIcon(load_icon("todo.ico"))
         self.setup_ui()
 
@@ -1317,25 +3657,11 @@ class InfoDialog(QDialog):
         layout.setContentsMargins(30, 30, 30, 30)
 
         title_label = QLabel("✔️ Simply TodoTask")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 20px;
-                font-weight: bold;
-                color: #2E86AB;
-                text-align: center;
-                padding: 10px 0px;
-            }
-        """)
+        title_label.setObjectName("infoTitle")
         layout.addWidget(title_label)
 
         info_card = QFrame()
-        info_card.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 12px;
-                padding: 0px;
-            }
-        """)
+        info_card.setObjectName("infoCard")
         info_layout = QVBoxLayout(info_card)
         info_layout.setSpacing(15)
         info_layout.setContentsMargins(20, 20, 20, 20)
@@ -1347,82 +3673,106 @@ class InfoDialog(QDialog):
             "• Save and load your lists in text format"
 
         )
-        desc_label.setStyleSheet("""
-            QLabel {
-                font-size: 12px;
-                color: #333333;
-                line-height: 1;
-                background-color: transparent;
-            }
-        """)
+        desc_label.setObjectName("infoText")
         desc_label.setWordWrap(False)
         info_layout.addWidget(desc_label)
 
         separator = QFrame()
         separator.setFrameShape(QFrame.Shape.HLine)
-        separator.setStyleSheet("background-color: #e0e0e0; margin: 10px 0px;")
+        separator.setObjectName("separator")
         info_layout.addWidget(separator)
 
         dev_info = QLabel("👨‍💻 Developed by Daniele Borghi")
-        dev_info.setStyleSheet("font-size: 12px; font-weight: bold; color: #2E86AB;")
+        dev_info.setObjectName("devInfo")
         info_layout.addWidget(dev_info)
 
         version_info = QLabel("📦 Version: 0.1 (November 2025)")
-        version_info.setStyleSheet("font-size: 11px; color: #666666;")
+        version_info.setObjectName("versionInfo")
         info_layout.addWidget(version_info)
 
         layout.addWidget(info_card)
 
-        github_btn = ModernButton("🐙 Visit repository on GitHub", "#333333", height=45)
+        github_btn = ModernButton("🐙 Visit repository on GitHub", "dark", height=45)
         github_btn.clicked.connect(lambda: webbrowser.open("https://github.com/danjiss/Simply-TodoTask-Checklist"))
         layout.addWidget(github_btn)
 
-        close_btn = ModernButton("Close", "#757575", height=45)
+        close_btn = ModernButton("Close", "neutral", height=45)
         close_btn.clicked.connect(self.accept)
         layout.addWidget(close_btn)
 
 class TodoApp(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.tasks = []
-        self.current_file_path = None
-        self.settings = {
-            "title": "Simply TodoTask",
-            "font_size": "medium",
-            "strikethrough": True
-        }
+        self.document = TodoDocument(self)
+        self.reminder_scheduler = ReminderScheduler(self.document, self)
+        self.reminder_scheduler.reminder_due.connect(self.show_reminder)
+        self.toast = Toast(self)
+        self.link_launcher = LinkLauncher(self)
+        self.link_launcher.failed.connect(self.show_link_error)
+        self.link_checker = LinkHealthChecker(self.document, self.link_launcher.path_cache, self)
+        self.link_checker.status_changed.connect(self.on_link_status_changed)
+        self.icon_loader = LinkIconLoader(self)
+        self.icon_loader.icon_ready.connect(self.on_link_icon_ready)
+        self.live_server = LiveServer(self.document, self, api_token_path())
+        self.task_cards = []
+        self.card_pool = WidgetPool()
+        self.row_pool = WidgetPool()
+        self.cards_by_link = {}
+        self.stale_cards = set()
+        self.scroll = None
+        self.rendered_mode = None
+        self.customizing = False
+        self.view_stale = False
+        self.applied_style = None
+        self.build_timer = QTimer(self)
+        self.build_timer.setSingleShot(True)
+        self.build_timer.setInterval(0)
+        self.build_timer.timeout.connect(self.build_next_batch)
+        self.batch_finished = 0.0
         self.setup_ui()
+        self.apply_theme()
         self.show_welcome_screen()
         self.setWindowIcon(load_icon("todo.ico"))
 
+        self.document.document_reset.connect(self.apply_theme)
+        self.document.settings_changed.connect(self.apply_theme)
+        self.document.document_reset.connect(self.on_document_changed)
+        self.document.structure_changed.connect(self.on_document_changed)
+        self.document.task_changed.connect(self.on_document_changed)
+        self.document.subtasks_changed.connect(self.on_document_changed)
+        self.document.settings_changed.connect(self.on_settings_changed)
+        self.document.checks_reset.connect(self.on_checks_reset)
+        self.document.collapse_changed.connect(self.on_collapse_changed)
+        self.document.check_changed.connect(self.on_check_changed)
+        self.document.undo_state_changed.connect(self.update_undo_actions)
+        self.update_undo_actions()
+
+        self.reset_scheduler = ResetScheduler(self)
+        self.reset_scheduler.reset_due.connect(self.on_scheduled_reset)
+        self.pending_reset = None
+        self.pending_file = None
+        self.document.document_reset.connect(self.update_reset_schedule)
+        self.document.settings_changed.connect(self.update_reset_schedule)
+
+    @property
+    def tasks(self):
+        return self.document.tasks
+
+    @property
+    def settings(self):
+        return self.document.settings
+
+    @property
+    def current_file_path(self):
+        return self.document.file_path
+
+    def closeEvent(self, event):
+        self.live_server.stop()
+        super().closeEvent(event)
+
     def setup_ui(self):
         self.setWindowTitle("Simply TodoTask")
         self.setGeometry(100, 100, 600, 850)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f8f9fa;
-                font-family: "Segoe UI", Arial, sans-serif;
-            }
-            QScrollBar:vertical {
-                background-color: #f0f0f0;
-                width: 12px;
-                border-radius: 6px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #c0c0c0;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #a0a0a0;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                border: none;
-                background: none;
-                height: 0px;
-            }
-        """)
 
         self.setup_menu()
 
@@ -1434,36 +3784,20 @@ class TodoApp(QMainWindow):
 
     def setup_menu(self):
         menubar = self.menuBar()
-        menubar.setStyleSheet("""
-            QMenuBar {
-                background-color: #ffffff;
-                border-bottom: 1px solid #e0e0e0;
-                padding: 4px;
-            }
-            QMenuBar::item {
-                padding: 6px 12px;
-                border-radius: 4px;
-            }
-            QMenuBar::item:selected {
-                background-color: #e3f2fd;
-            }
-            QMenu {
-                background-color: white;
-                border: 1px solid #cccccc;
-                border-radius: 6px;
-                padding: 4px;
-            }
-            QMenu::item {
-                padding: 6px 24px 6px 12px;
-            }
-            QMenu::item:selected {
-                background-color: #2196F3;
-                color: white;
-                border-radius: 4px;
-            }
-        """)
 
         actions_menu = menubar.addMenu("Actions")
+
+        self.undo_action = QAction("Undo", self)
+        self.undo_action.setShortcut(QKeySequence.StandardKey.Undo)
+        self.undo_action.triggered.connect(self.document.undo)
+        actions_menu.addAction(self.undo_action)
+
+        self.redo_action = QAction("Redo", self)
+        self.redo_action.setShortcut(QKeySequence.StandardKey.Redo)
+        self.redo_action.triggered.connect(self.document.redo)
+        actions_menu.addAction(self.redo_action)
+
+        actions_menu.addSeparator()
         
         reset_action = QAction("Reset", self)
         reset_action.triggered.connect(self.show_reset_dialog)
@@ -1482,7 +3816,43 @@ class TodoApp(QMainWindow):
         load_action = QAction("Load list", self)
         load_action.triggered.connect(self.load_configuration)
         list_menu.addAction(load_action)
+
+        export_action = QAction("Export as HTML", self)
+        export_action.triggered.connect(self.export_html)
+        list_menu.addAction(export_action)
+
+        list_menu.addSeparator()
+
+        self.serve_action = QAction("Open in browser (live)", self)
+        self.serve_action.setCheckable(True)
+        self.serve_action.triggered.connect(self.toggle_live_server)
+        list_menu.addAction(self.serve_action)
         
+        view_menu = menubar.addMenu("View")
+
+        self.dark_theme_action = QAction("Dark theme", self)
+        self.dark_theme_action.setCheckable(True)
+        self.dark_theme_action.triggered.connect(
+            lambda checked: self.document.set_settings({"theme": "dark" if checked else "light"})
+        )
+        view_menu.addAction(self.dark_theme_action)
+
+        self.lite_action = QAction("Lite rendering", self)
+        self.lite_action.setCheckable(True)
+        self.lite_action.triggered.connect(
+            lambda checked: self.document.set_settings({"render_mode": "lite" if checked else "standard"})
+        )
+        view_menu.addAction(self.lite_action)
+        view_menu.addSeparator()
+
+        expand_all_action = QAction("Expand all", self)
+        expand_all_action.triggered.connect(lambda: self.document.set_collapsed(range(len(self.tasks)), False))
+        view_menu.addAction(expand_all_action)
+
+        collapse_all_action = QAction("Collapse all", self)
+        collapse_all_action.triggered.connect(lambda: self.document.set_collapsed(range(len(self.tasks)), True))
+        view_menu.addAction(collapse_all_action)
+
         info_menu = menubar.addMenu("?")
         
         about_action = QAction("Information", self)
@@ -1492,8 +3862,167 @@ class TodoApp(QMainWindow):
     def show_info_dialog(self):
         dialog = InfoDialog(self)
         dialog.exec()
+        dialog.deleteLater()
+
+    def apply_theme(self):
+        style = tuple(self.settings.get(key) for key in ('theme', 'render_mode'))
+        self.dark_theme_action.setChecked(self.settings.get('theme') == "dark")
+        self.lite_action.setChecked(is_lite(self.settings))
+        if style != self.applied_style:
+            self.applied_style = style
+            apply_theme(QApplication.instance(), self.settings)
+
+    def update_undo_actions(self):
+        undo_stack = self.document.undo_stack
+        self.undo_action.setEnabled(undo_stack.can_undo())
+        self.redo_action.setEnabled(undo_stack.can_redo())
+        self.undo_action.setText(f"Undo {undo_stack.undo_text()}".strip())
+        self.redo_action.setText(f"Redo {undo_stack.redo_text()}".strip())
+
+    def on_scheduled_reset(self, when):
+        if self.customizing:
+            self.pending_reset = when
+        else:
+            self.document.scheduled_reset(when)
+
+    def show_reminder(self, task_index, sub_index):
+        task = self.tasks[task_index]
+        if sub_index < 0:
+            text = f"⏰ Due now: {task['name']}"
+        else:
+            text = f"⏰ Due now: {task['sub_tasks'][sub_index]} ({task['name']})"
+        self.toast.add_message(text)
+        QApplication.alert(self)
+
+    def on_link_status_changed(self, link, ok):
+        if self.customizing:
+            return
+        for card in self.cards_by_link.get(link, ()):
+            card.set_link_status(ok)
+
+    def show_link_error(self, link, message):
+        self.toast.add_message(f"⚠️ Cannot open {link}: {message}")
+
+    def update_reset_schedule(self):
+        self.reset_scheduler.set_schedule(self.settings.get('reset_schedule', ''))
+
+    def on_document_changed(self, *args):
+        if self.customizing:
+            self.view_stale = True
+        else:
+            self.refresh_tasks()
+
+    def on_settings_changed(self):
+        self.update_pool_limit()
+        if self.scroll is None:
+            return
+        if self.rendered_mode != self.settings.get('render_mode'):
+            if not self.customizing:
+                self.refresh_tasks()
+            return
+        self.header_title.setText(self.settings.get('title', 'Simply TodoTask'))
+        for card in self.task_cards:
+            card.apply_settings()
+
+    def on_check_changed(self, task_index, sub_index, checked):
+        if self.customizing:
+            self.view_stale = True
+        elif task_index < len(self.task_cards):
+            self.task_cards[task_index].set_checked(sub_index, checked)
+            self.update_progress()
+
+    def on_checks_reset(self, task_indices):
+        if self.customizing:
+            self.view_stale = True
+            return
+        if self.scroll is None:
+            return
+        for task_index in task_indices:
+            if task_index < len(self.task_cards):
+                self.task_cards[task_index].mark_stale()
+                self.stale_cards.add(task_index)
+        self.update_progress()
+        self.update_visible_cards()
+
+    def on_collapse_changed(self, task_indices):
+        if self.customizing:
+            self.view_stale = True
+            return
+        for task_index in task_indices:
+            if task_index < len(self.task_cards):
+                self.task_cards[task_index].update_collapsed()
+                self.stale_cards.discard(task_index)
+        if self.scroll is not None:
+            QTimer.singleShot(0, self.update_visible_cards)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.toast.isVisible():
+            self.toast.reposition()
+        if self.scroll is not None:
+            QTimer.singleShot(0, self.update_visible_cards)
+
+    def viewport_range(self):
+        top = self.scroll.verticalScrollBar().value()
+        return top, top + self.scroll.viewport().height()
+
+    def visible_cards(self):
+        cards = self.task_cards
+        if self.scroll is None or not cards:
+            return range(0)
+        self.scroll.widget().layout().activate()
+        top, bottom = self.viewport_range()
+        low, high = 0, len(cards)
+        while low < high:
+            middle = (low + high) // 2
+            if cards[middle].geometry().bottom() < top:
+                low = middle + 1
+            else:
+                high = middle
+        end = low
+        while end < len(cards) and cards[end].y() <= bottom:
+            end += 1
+        return range(low, end)
+
+    def update_visible_cards(self):
+        if self.scroll is None or self.customizing:
+            return
+        if len(self.task_cards) < len(self.tasks):
+            self.build_revealed_cards()
+        visible = self.visible_cards()
+        if self.stale_cards:
+            top, bottom = self.viewport_range()
+            scroll_widget = self.scroll.widget()
+            scroll_widget.setUpdatesEnabled(False)
+            for task_index in visible:
+                if task_index in self.stale_cards:
+                    card = self.task_cards[task_index]
+                    if card.sync_visible(top - card.y(), bottom - card.y()):
+                        self.stale_cards.discard(task_index)
+            scroll_widget.setUpdatesEnabled(True)
+        for task_index in visible:
+            card = self.task_cards[task_index]
+            link = card.task_data.get('link', '')
+            if not card.icon_requested and is_file_link(link):
+                card.icon_requested = True
+                icon = self.icon_loader.request(link)
+                if icon is not None:
+                    card.set_link_icon(icon)
+
+    def on_link_icon_ready(self, link, icon):
+        if self.customizing:
+            return
+        for card in self.cards_by_link.get(link, ()):
+            if card.icon_requested:
+                card.set_link_icon(icon)
+
+    def update_progress(self):
+        checked, total = self.document.progress()
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(checked)
 
     def show_welcome_screen(self):
+        self.discard_cards()
         self.clear_layout(self.main_layout)
 
         welcome_screen = WelcomeScreen()
@@ -1505,24 +4034,109 @@ class TodoApp(QMainWindow):
     def clear_layout(self, layout):
         while layout.count():
             child = layout.takeAt(0)
-            if child.widget():
-                child.widget().setParent(None)
+            widget = child.widget()
+            if widget:
+                widget.setParent(None)
+                widget.deleteLater()
+
+    def update_pool_limit(self):
+        limit = self.settings.get('widget_pool_size', DEFAULT_SETTINGS['widget_pool_size'])
+        for card in self.card_pool.set_limit(limit):
+            self.row_pool.discard(card)
+        self.row_pool.set_limit(limit)
+
+    def release_card(self, card):
+        if not self.card_pool.release(card):
+            self.row_pool.discard(card)
+
+    def discard_cards(self):
+        self.build_timer.stop()
+        self.task_cards = []
+        self.card_pool.clear()
+        self.row_pool.clear()
+        self.scroll = None
 
     def refresh_tasks(self):
-        self.clear_layout(self.main_layout)
+        self.update_pool_limit()
+        self.cards_by_link = {}
+        self.stale_cards = set()
+        render_mode = self.settings.get('render_mode')
+        if render_mode != self.rendered_mode:
+            self.discard_cards()
+        self.rendered_mode = render_mode
 
         if not self.tasks:
             self.show_welcome_screen()
             return
 
+        if self.scroll is None:
+            self.build_task_view()
+        else:
+            self.header_title.setText(self.settings.get('title', 'Simply TodoTask'))
+        self.update_progress()
+
+        while len(self.task_cards) > len(self.tasks):
+            self.release_card(self.task_cards.pop())
+        for task_card in reversed(self.task_cards):
+            self.release_card(task_card)
+        self.task_cards = []
+        self.build_cards(self.scroll.viewport().height())
+        self.resume_build()
+        QTimer.singleShot(0, self.update_visible_cards)
+
+    def build_cards(self, height=None, budget=BUILD_BATCH_SECONDS):
+        scroll_widget = self.scroll.widget()
+        scroll_layout = scroll_widget.layout()
+        deadline = time.perf_counter() + budget
+        built = 0
+        while len(self.task_cards) < len(self.tasks):
+            i = len(self.task_cards)
+            task = self.tasks[i]
+            task_card = self.card_pool.acquire(scroll_widget)
+            if task_card is None:
+                task_card = TaskCard(self.document, i, self.row_pool)
+                task_card.link_activated.connect(self.link_launcher.open)
+                scroll_layout.addWidget(task_card)
+            else:
+                task_card.bind(i)
+            task_card.show()
+            self.task_cards.append(task_card)
+            task_card.set_link_status(self.link_checker.status(task.get('link', '')))
+            if task.get('link'):
+                self.cards_by_link.setdefault(task['link'], []).append(task_card)
+            if height is None:
+                if time.perf_counter() >= deadline:
+                    break
+            else:
+                built += task_card.sizeHint().height()
+                if built >= height:
+                    break
+
+    def resume_build(self):
+        self.batch_finished = time.perf_counter()
+        self.build_timer.start()
+
+    def build_next_batch(self):
+        if self.scroll is None or self.customizing:
+            return
+        # Every batch makes Qt relayout the whole list, so a batch gets at least as long as that took.
+        self.build_cards(budget=max(BUILD_BATCH_SECONDS, time.perf_counter() - self.batch_finished))
+        self.batch_finished = time.perf_counter()
+        if len(self.task_cards) < len(self.tasks):
+            self.build_timer.start()
+        else:
+            self.update_visible_cards()
+
+    def build_revealed_cards(self):
+        scroll_bar = self.scroll.verticalScrollBar()
+        if scroll_bar.value() + scroll_bar.pageStep() >= scroll_bar.maximum():
+            self.build_cards(self.scroll.viewport().height())
+
+    def build_task_view(self):
+        self.clear_layout(self.main_layout)
+
         header = QFrame()
-        header.setStyleSheet("""
-            QFrame {
-                background-color: #2E86AB;
-                border-radius: 12px;
-                padding: 0px;
-            }
-        """)
+        header.setObjectName("header")
         header.setFixedHeight(90)
         
         header_layout = QHBoxLayout(header)
@@ -1530,33 +4144,39 @@ class TodoApp(QMainWindow):
         header_layout.setSpacing(15)
         
         icon_label = QLabel()
-        icon_pixmap = load_pixmap("todo1.png")
+        icon_pixmap = load_scaled_pixmap("todo1.png", 32)
         if not icon_pixmap.isNull():
-            icon_pixmap = icon_pixmap.scaled(32, 32, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
             icon_label.setPixmap(icon_pixmap)
         else:
             icon_label.setText("📝")
-            icon_label.setStyleSheet("font-size: 24px; color: white;")
-        icon_label.setStyleSheet("background-color: transparent;")
+            icon_label.setObjectName("headerIcon")
         icon_label.setFixedSize(32, 32)
         
         title_label = QLabel(self.settings.get('title', 'Simply TodoTask'))
-        title_label.setStyleSheet("""
-            QLabel {
-                color: white;
-                font-size: 20px;
-                font-weight: bold;
-                padding: 5px 0px;
-                background-color: transparent;
-            }
-        """)
+        title_label.setObjectName("headerTitle")
+        self.header_title = title_label
+        if is_lite(self.settings):
+            font = title_label.font()
+            font.setBold(True)
+            font.setPointSize(font.pointSize() + 4)
+            title_label.setFont(font)
         title_label.setWordWrap(True)
         title_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
         title_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedHeight(16)
+        self.progress_bar.setFormat("%v / %m  (%p%)")
+        self.progress_bar.setObjectName("headerProgress")
+
+        title_layout = QVBoxLayout()
+        title_layout.setSpacing(4)
+        title_layout.addWidget(title_label)
+        title_layout.addWidget(self.progress_bar)
         
         buttons_layout = QHBoxLayout()
-        personalize_btn = ModernButton("Customize", "#2196F3", height=40)
-        reset_btn = ModernButton("Reset", "#757575", height=40)
+        personalize_btn = ModernButton("Customize", "primary", height=40)
+        reset_btn = ModernButton("Reset", "neutral", height=40)
         
         personalize_btn.clicked.connect(self.customize_tasks)
         reset_btn.clicked.connect(self.show_reset_dialog)
@@ -1565,7 +4185,7 @@ class TodoApp(QMainWindow):
         buttons_layout.addWidget(reset_btn)
         
         header_layout.addWidget(icon_label)
-        header_layout.addWidget(title_label, 1)
+        header_layout.addLayout(title_layout, 1)
         header_layout.addLayout(buttons_layout)
         
         self.main_layout.addWidget(header)
@@ -1574,12 +4194,6 @@ class TodoApp(QMainWindow):
         scroll.setWidgetResizable(True)
         scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-        """)
         
         scroll_widget = QWidget()
         scroll_layout = QVBoxLayout(scroll_widget)
@@ -1587,87 +4201,17 @@ class TodoApp(QMainWindow):
         scroll_layout.setSpacing(0)
         scroll_layout.setContentsMargins(2, 2, 2, 2)
 
-        font_sizes = {
-            "small": 12,
-            "medium": 14,
-            "large": 16
-        }
-        font_size = font_sizes.get(self.settings.get('font_size', 'medium'), 14)
-
-        for i, task in enumerate(self.tasks):
-            task_card = TaskCard(task, i, font_size, self.settings.get('strikethrough', True))
-            scroll_layout.addWidget(task_card)
-
         scroll.setWidget(scroll_widget)
         self.main_layout.addWidget(scroll, 1)
+        self.scroll = scroll
+        scroll.verticalScrollBar().valueChanged.connect(self.update_visible_cards)
 
     def load_configuration(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Load list", "", "Text files (*.txt);;All files (*.*)"
         )
         if file_path:
-            try:
-                tasks = []
-                settings = {
-                    "title": "Simply TodoTask",
-                    "font_size": "medium",
-                    "strikethrough": True
-                }
-                
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    
-                    current_task = None
-                    i = 0
-                    while i < len(lines):
-                        line = lines[i].strip()
-                        if line.startswith("[SETTINGS]"):
-                            i += 1
-                            while i < len(lines) and not lines[i].startswith("[TASK]") and lines[i].strip() != "":
-                                line = lines[i].strip()
-                                if line.startswith("title="):
-                                    settings["title"] = line.split('=', 1)[1]
-                                elif line.startswith("font_size="):
-                                    font_size = line.split('=', 1)[1]
-                                    if font_size in ['piccolo', 'medio', 'grande']:
-                                        font_size = 'small' if font_size == 'piccolo' else 'medium' if font_size == 'medio' else 'large'
-                                    settings["font_size"] = font_size
-                                elif line.startswith("strikethrough="):
-                                    settings["strikethrough"] = line.split('=', 1)[1].lower() == "true"
-                                i += 1
-                            continue
-                        elif line.startswith("[TASK]"):
-                            if current_task:
-                                tasks.append(current_task)
-                            current_task = {
-                                "name": "",
-                                "sub_tasks": [],
-                                "base_color": "default",
-                                "selected_color": "default",
-                                "link": ""
-                            }
-                        elif line.startswith("name=") and current_task is not None:
-                            current_task["name"] = line[5:]
-                        elif line.startswith("base_color=") and current_task is not None:
-                            current_task["base_color"] = line[11:]
-                        elif line.startswith("selected_color=") and current_task is not None:
-                            current_task["selected_color"] = line[15:]
-                        elif line.startswith("link=") and current_task is not None:
-                            current_task["link"] = line[5:]
-                        elif line.startswith("sub_task=") and current_task is not None:
-                            current_task["sub_tasks"].append(line[9:])
-                        i += 1
-                    
-                    if current_task:
-                        tasks.append(current_task)
-                
-                self.tasks = tasks
-                self.settings = settings
-                self.current_file_path = file_path
-                self.refresh_tasks()
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Cannot load the list: {e}")
+            self.open_file(file_path)
 
     def save_configuration(self):
         if not self.current_file_path:
@@ -1676,6 +4220,7 @@ class TodoApp(QMainWindow):
             
         dialog = SaveDialog(self)
         result = dialog.exec()
+        dialog.deleteLater()
         
         if result == 1:
             self._save_to_file(self.current_file_path)
@@ -1691,36 +4236,79 @@ class TodoApp(QMainWindow):
 
     def _save_to_file(self, file_path):
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write("[SETTINGS]\n")
-                f.write(f"title={self.settings['title']}\n")
-                f.write(f"font_size={self.settings['font_size']}\n")
-                f.write(f"strikethrough={self.settings['strikethrough']}\n")
-                f.write("\n")
-                
-                for task in self.tasks:
-                    f.write("[TASK]\n")
-                    f.write(f"name={task['name']}\n")
-                    f.write(f"base_color={task.get('base_color', 'default')}\n")
-                    f.write(f"selected_color={task.get('selected_color', 'default')}\n")
-                    f.write(f"link={task.get('link', '')}\n")
-                    for sub_task in task['sub_tasks']:
-                        f.write(f"sub_task={sub_task}\n")
-                    f.write("\n")
-            
-            self.current_file_path = file_path
-            
+            self.document.save(file_path)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Cannot save the list: {e}")
 
+    def export_html(self):
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export as HTML", "", "HTML page (*.html);;Minified HTML page (*.html)"
+        )
+        if file_path:
+            try:
+                self.document.export_html(file_path, minify=selected_filter.startswith("Minified"))
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Cannot export the list: {e}")
+
+    def toggle_live_server(self, checked):
+        if checked:
+            self.start_live_server(open_browser=True)
+        else:
+            self.live_server.stop()
+
+    def start_live_server(self, address=None, open_browser=False):
+        try:
+            url = self.live_server.start(address)
+        except Exception as e:
+            self.serve_action.setChecked(False)
+            QMessageBox.critical(self, "Error", f"Cannot start the web server: {e}")
+            return
+        self.serve_action.setChecked(True)
+        self.toast.add_message(f"🌐 Serving the list at {url}")
+        if open_browser and url.startswith("http"):
+            QDesktopServices.openUrl(QUrl(url))
+
     def customize_tasks(self):
-        dialog = CustomizeDialog(self, self.tasks, self.current_file_path, self.settings)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
+        self.customizing = True
+        self.view_stale = False
+        dialog = CustomizeDialog(self, self.document)
+        dialog.exec()
+        dialog.deleteLater()
+        self.customizing = False
+        if self.view_stale or self.rendered_mode != self.settings.get('render_mode'):
             self.refresh_tasks()
+        elif self.scroll is not None and len(self.task_cards) < len(self.tasks):
+            self.resume_build()
+        if self.pending_reset is not None:
+            self.document.scheduled_reset(self.pending_reset)
+            self.pending_reset = None
+        if self.pending_file is not None:
+            self.open_file(self.pending_file)
+            self.pending_file = None
+
+    def open_files(self, file_paths):
+        # Files handed over by a second launch; the window holds one list, so the last one wins
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+        if not file_paths:
+            return
+        if self.customizing:
+            self.pending_file = file_paths[-1]
+        else:
+            self.open_file(file_paths[-1])
+
+    def open_file(self, file_path):
+        try:
+            self.document.load(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Cannot load the list: {e}")
 
     def show_reset_dialog(self):
         dialog = ResetDialog(self)
         result = dialog.exec()
+        dialog.deleteLater()
         
         if result == 1:
             self.reset_checks()
@@ -1728,18 +4316,27 @@ class TodoApp(QMainWindow):
             self.reset_tasks()
 
     def reset_checks(self):
-        self.refresh_tasks()
+        self.document.reset_checks()
 
     def reset_tasks(self):
-        self.tasks = []
-        self.refresh_tasks()
+        self.document.clear_tasks()
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    # args and qt_args were parsed at the top of the file, before the handoff
+    app = QApplication(sys.argv[:1] + qt_args)
     
     app.setStyle("Fusion")
     
     window = TodoApp()
+    if not args.new_instance:
+        instance_server = InstanceServer(window)
+        instance_server.files_received.connect(window.open_files)
+        instance_server.serve_requested.connect(lambda address: window.start_live_server(address or None))
+        instance_server.listen()
+    if args.serve is not None:
+        window.start_live_server(args.serve or None)
+    if args.files:
+        window.open_file(os.path.abspath(args.files[-1]))
     window.show()
     
     sys.exit(app.exec())